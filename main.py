@@ -2,16 +2,34 @@
 Main orchestrator for the Python Latent Space Explorer (PLSE) v2.0.
 """
 
+import io
 import os
 import json
-from typing import Dict, Optional
+import queue
+import threading
+from collections import Counter
+from concurrent.futures import Future, ProcessPoolExecutor, wait, FIRST_COMPLETED
+from typing import Dict, List, Optional, Tuple
+
+# orjson is a C extension that emits bytes directly; fall back to the stdlib
+# encoder when it is not installed.
+try:
+    import orjson
+
+    def _dumps(record: Dict[str, str]) -> bytes:
+        return orjson.dumps(record)
+except ImportError:
+    def _dumps(record: Dict[str, str]) -> bytes:
+        # The same bytes as orjson writes: compact, with non-ASCII left as is.
+        return json.dumps(record, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
 
 # We will import from the 'plse' package we are about to install.
 # The 'src' layout requires a proper installation to work correctly.
 try:
     from src.plse.registry import PatternRegistry
-    from src.plse.generator import PLSEGenerator
+    from src.plse.generator import PLSEGenerator, code_fingerprint
     from src.plse.validation import ValidationPipeline
+    from src.plse.patterns import PLSEPattern
 except ImportError:
     # This block is a fallback in case the package isn't installed yet,
     # allowing the script to still be understood by some tools.
@@ -20,6 +38,102 @@ except ImportError:
     class PatternRegistry: pass
     class PLSEGenerator: pass
     class ValidationPipeline: pass
+    class PLSEPattern: pass
+
+
+# Output is streamed through a 1 MiB buffer and flushed every FLUSH_EVERY
+# examples as a checkpoint.
+WRITE_BUFFER_SIZE = 1024 * 1024
+FLUSH_EVERY = 100
+
+# A pattern that has produced no valid example after this many attempts is
+# taken out of rotation for the rest of the run.
+DISABLE_AFTER_ATTEMPTS = 50
+
+# Number of candidates rendered per pattern selection. Each pool task draws a
+# pattern once and renders this many candidates against its warm caches.
+CANDIDATES_PER_TASK = 8
+
+# Bound on examples waiting for the writer thread before generation blocks.
+WRITE_QUEUE_SIZE = 1000
+
+def _writer_loop(out_q: queue.Queue, f, errors: List[Exception]):
+    """
+    Drains examples from `out_q` into the open binary file `f` until a None
+    sentinel arrives. Errors writing or serialising an example are recorded
+    in `errors`; the queue keeps draining afterwards so the producer never
+    blocks on a dead writer.
+    """
+    written = 0
+    while True:
+        example = out_q.get()
+        if example is None:
+            return
+        if errors:
+            continue
+        try:
+            f.write(_dumps(example) + b'\n')
+            written += 1
+            if written % FLUSH_EVERY == 0:
+                f.flush()
+        except Exception as e:
+            errors.append(e)
+
+# Seconds between checks that the writer thread is still alive while the
+# producer waits on a full queue.
+WRITER_CHECK_INTERVAL = 1.0
+
+def _put_for_writer(out_q: queue.Queue, writer: threading.Thread, item: Optional[Dict[str, str]]):
+    """
+    Puts `item` on the writer's queue, waiting while it is full. Raises
+    RuntimeError if the writer thread has stopped, rather than waiting forever.
+    """
+    while True:
+        try:
+            out_q.put(item, timeout=WRITER_CHECK_INTERVAL)
+            return
+        except queue.Full:
+            if not writer.is_alive():
+                raise RuntimeError("The dataset writer thread stopped unexpectedly.")
+
+# Per-process state for the generation pool. Built once by `_init_worker` so
+# each worker reuses its generator and validators across tasks.
+_WORKER_STATE: Dict[str, object] = {}
+
+def _init_worker(use_pylint: bool, patterns: List[PLSEPattern]):
+    """
+    Initializer for pool workers: builds the generator and pipeline once and
+    compiles every pattern's templates up front. The pipeline's sandbox
+    worker starts meanwhile.
+    """
+    pipeline = ValidationPipeline(use_pylint=use_pylint)
+    pipeline.warm_up()
+    _WORKER_STATE["pipeline"] = pipeline
+    _WORKER_STATE["generator"] = PLSEGenerator(validate=False, patterns=patterns)
+
+# This function must be at the top level to be pickleable by multiprocessing
+def _worker(pattern: PLSEPattern, count: int) -> List[Tuple[int, Dict[str, str]]]:
+    """
+    Generates up to `count` unique candidates from `pattern` inside a worker
+    and validates each one. Returns (code_hash, example) pairs for the valid
+    candidates so the parent can deduplicate across workers.
+    """
+    # The batch reuses one compiled template and sampler list; validation is
+    # done here by the pipeline, so the generator's own pass is skipped.
+    candidates = _WORKER_STATE["generator"].generate_batch(pattern, count=count, validate_sample=False)
+
+    results = []
+    for code, instruction, tests in candidates:
+        validation_result = _WORKER_STATE["pipeline"].validate(code, tests)
+        if not validation_result.valid:
+            continue
+        code_hash = code_fingerprint(validation_result.code)
+        results.append((code_hash, {
+            "instruction": instruction,
+            "input": "",
+            "output": validation_result.code,
+        }))
+    return results
 
 
 class TrainingDataGenerator:
@@ -30,6 +144,7 @@ class TrainingDataGenerator:
 
     def __init__(self, patterns_dir: str, use_pylint: bool = False):
         print("Initializing PLSE v2.0 components...")
+        self.use_pylint = use_pylint
         self.registry = PatternRegistry(patterns_dir)
         self.generator = PLSEGenerator()
         self.pipeline = ValidationPipeline(use_pylint=use_pylint)
@@ -58,31 +173,101 @@ class TrainingDataGenerator:
             "output": validation_result.code,
         }
 
-    def generate_dataset(self, n_examples: int, output_file: str):
-        """Generates a complete dataset of a specified size."""
-        examples = []
+    def generate_dataset(self, n_examples: int, output_file: str, num_workers: Optional[int] = None):
+        """
+        Generates a complete dataset of a specified size.
+
+        Candidates are generated and validated in a process pool, in batches
+        of `CANDIDATES_PER_TASK` per pattern selection; the parent
+        keeps a bounded number of tasks in flight, deduplicates results by
+        code hash, and refills the queue until `n_examples` are collected.
+        Each accepted example is handed to a background writer thread that
+        streams it to `output_file` through a large write buffer, flushing
+        every `FLUSH_EVERY` examples so partial progress survives a crash.
+        Patterns that fail `DISABLE_AFTER_ATTEMPTS` times without a single
+        success are removed from the registry's rotation.
+        """
+        written = 0
+        seen_hashes: set[int] = set()
         attempts = 0
         max_attempts = n_examples * 200
-
-        print(f"\nGenerating {n_examples} training examples...")
-        while len(examples) < n_examples and attempts < max_attempts:
-            example = self.generate_example()
-            if example:
-                examples.append(example)
-                if len(examples) % 10 == 0 or len(examples) == n_examples:
-                    print(f"  Generated {len(examples)}/{n_examples} examples...")
-            attempts += 1
+        attempts_per_pattern: Counter = Counter()
+        successes_per_pattern: Counter = Counter()
+        disabled: set[str] = set()
+        num_workers = num_workers or os.cpu_count() or 1
 
         try:
-            with open(output_file, 'w') as f:
-                for example in examples:
-                    f.write(json.dumps(example) + '\n')
-            print(f"\n✅ Successfully saved {len(examples)} examples to {output_file}")
+            f = io.open(output_file, 'wb', buffering=WRITE_BUFFER_SIZE)
         except IOError as e:
-            print(f"\n❌ Error saving dataset to {output_file}: {e}")
+            print(f"\n❌ Error opening {output_file} for writing: {e}")
+            return
+        out_q: queue.Queue = queue.Queue(maxsize=WRITE_QUEUE_SIZE)
+        write_errors: List[Exception] = []
+        writer = threading.Thread(target=_writer_loop, args=(out_q, f, write_errors), daemon=True)
+        writer.start()
+
+        print(f"\nGenerating {n_examples} training examples with {num_workers} workers...")
+        try:
+            with ProcessPoolExecutor(max_workers=num_workers,
+                                     initializer=_init_worker,
+                                     initargs=(self.use_pylint, self.registry.patterns)) as executor:
+                pending: Dict[Future, str] = {}
+
+                def refill():
+                    nonlocal attempts
+                    while len(pending) < 2 * num_workers and attempts < max_attempts:
+                        pattern = self.registry.get_random()
+                        if not pattern:
+                            return
+                        pending[executor.submit(_worker, pattern, CANDIDATES_PER_TASK)] = pattern.pattern_id
+                        attempts += CANDIDATES_PER_TASK
+
+                refill()
+                while pending and written < n_examples:
+                    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        pattern_id = pending.pop(future)
+                        results = future.result()
+                        attempts_per_pattern[pattern_id] += CANDIDATES_PER_TASK
+                        if results:
+                            successes_per_pattern[pattern_id] += len(results)
+                        elif (attempts_per_pattern[pattern_id] >= DISABLE_AFTER_ATTEMPTS
+                              and not successes_per_pattern[pattern_id]
+                              and pattern_id not in disabled):
+                            # Stop drawing a pattern that has never produced a valid example
+                            print(f"  Disabling '{pattern_id}' after {attempts_per_pattern[pattern_id]} failed attempts.")
+                            self.registry.disable(pattern_id)
+                            disabled.add(pattern_id)
+                        for code_hash, example in results:
+                            if written >= n_examples or code_hash in seen_hashes:
+                                continue
+                            seen_hashes.add(code_hash)
+                            _put_for_writer(out_q, writer, example)
+                            written += 1
+                            if written % 10 == 0 or written == n_examples:
+                                print(f"  Generated {written}/{n_examples} examples...")
+                    refill()
+
+                for future in pending:
+                    future.cancel()
+        finally:
+            try:
+                _put_for_writer(out_q, writer, None)
+            except RuntimeError:
+                pass
+            writer.join()
+            try:
+                f.close()
+            except IOError as e:
+                write_errors.append(e)
+
+        if write_errors:
+            print(f"\n❌ Error saving dataset to {output_file}: {write_errors[0]}")
+        else:
+            print(f"\n✅ Successfully saved {written} examples to {output_file}")
 
-        if len(examples) < n_examples:
-            print(f"Warning: Could only generate {len(examples)} out of {n_examples} desired examples after {max_attempts} attempts.")
+        if written < n_examples:
+            print(f"Warning: Could only generate {written} out of {n_examples} desired examples after {attempts} attempts.")
 
 def main():
     """Main entry point for the script."""
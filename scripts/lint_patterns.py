@@ -5,8 +5,7 @@ A high-performance, parallel diagnostic script to lint all generated patterns.
 import sys
 import os
 from typing import List, Tuple, Dict
-from concurrent.futures import ProcessPoolExecutor, as_completed
-from dataclasses import asdict
+from concurrent.futures import ProcessPoolExecutor
 
 # Add the project root to the path to allow importing from 'src'
 sys.path.insert(0, '.')
@@ -14,31 +13,37 @@ sys.path.insert(0, '.')
 try:
     from src.plse.registry import PatternRegistry
     from src.plse.generator import PLSEGenerator
-    from src.plse.validation import SyntaxValidator, Flake8Validator
+    from src.plse.validation import Flake8Validator
     from src.plse.patterns import PLSEPattern
-    from src.plse.schema import PLSEPatternSchema # Import the Pydantic schema
 except ImportError as e:
     print(f"FATAL: Could not import PLSE modules. Ensure you have run 'pip install -e .'. Error: {e}")
     sys.exit(1)
 
+# Per-process state, built once by `_init_worker` so every task a worker runs
+# reuses the same generator (and its compiled template cache) and validators.
+_WORKER_STATE: Dict = {}
+
+def _init_worker():
+    """Initializer for pool workers."""
+    _WORKER_STATE["generator"] = PLSEGenerator()
+    # No separate SyntaxValidator: flake8 parses the code anyway and reports
+    # syntax errors itself as E999, so a second parse would only repeat them.
+    _WORKER_STATE["validators"] = [Flake8Validator()]
+
 # This function must be at the top level to be pickleable by multiprocessing
-def check_single_pattern(pattern_dict: Dict) -> Tuple[str, List[str]]:
+def check_single_pattern(pattern: PLSEPattern) -> Tuple[str, List[str]]:
     """
     Worker function to generate and validate a single pattern.
-    Receives a dictionary and correctly reconstructs the nested PLSEPattern object.
+    Receives the already-validated PLSEPattern; dataclasses pickle directly,
+    so there is no need to re-run the Pydantic schema in the worker.
     """
-    generator = PLSEGenerator()
-    validators = [SyntaxValidator(), Flake8Validator()]
+    if not _WORKER_STATE:
+        _init_worker()
+    generator = _WORKER_STATE["generator"]
+    validators = _WORKER_STATE["validators"]
     errors: List[str] = []
-    pattern_id = pattern_dict.get("pattern_id", "unknown_pattern")
 
     try:
-        # --- BUG FIX: Properly reconstruct the nested dataclass object ---
-        # 1. Load the dict into the Pydantic schema for validation.
-        schema = PLSEPatternSchema(**pattern_dict)
-        # 2. Use our trusted factory method to build the full object.
-        pattern = PLSEPattern.from_schema(schema)
-        
         generation_result = generator.generate(pattern)
         
         if not generation_result:
@@ -53,8 +58,8 @@ def check_single_pattern(pattern_dict: Dict) -> Tuple[str, List[str]]:
                 
         return pattern.pattern_id, errors
     except Exception as e:
-        # Catch any unexpected errors during reconstruction or validation
-        return pattern_id, [f"Worker process failed: {type(e).__name__}: {e}"]
+        # Catch any unexpected errors during generation or validation
+        return pattern.pattern_id, [f"Worker process failed: {type(e).__name__}: {e}"]
 
 
 def analyze_and_suggest_fixes(pattern_id: str, errors: List[str]):
@@ -85,24 +90,26 @@ def main():
         print("No patterns found to lint.")
         return
 
-    pattern_dicts = [asdict(p) for p in registry.patterns]
+    patterns = list(registry.patterns)
     failed_patterns: Dict[str, List[str]] = {}
     passed_count = 0
     num_workers = min(4, os.cpu_count() or 1)
     print(f"Found {len(registry)} patterns. Starting parallel check with {num_workers} workers...")
 
-    with ProcessPoolExecutor(max_workers=num_workers) as executor:
-        futures = {executor.submit(check_single_pattern, pd): pd for pd in pattern_dicts}
-        
+    with ProcessPoolExecutor(max_workers=num_workers, initializer=_init_worker) as executor:
+        # Ship patterns to workers in chunks so each IPC round-trip carries
+        # several tasks instead of one.
+        chunksize = max(1, len(patterns) // (num_workers * 4))
+        results = executor.map(check_single_pattern, patterns, chunksize=chunksize)
+
         try:
             from tqdm import tqdm
-            progress_iterator = tqdm(as_completed(futures), total=len(futures), desc="Linting Patterns")
+            progress_iterator = tqdm(results, total=len(patterns), desc="Linting Patterns")
         except ImportError:
             print("tqdm not found, running without progress bar.")
-            progress_iterator = as_completed(futures)
+            progress_iterator = results
 
-        for future in progress_iterator:
-            pattern_id, errors = future.result()
+        for pattern_id, errors in progress_iterator:
             if errors:
                 failed_patterns[pattern_id] = errors
             else:
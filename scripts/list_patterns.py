@@ -14,6 +14,11 @@ import yaml
 import argparse
 from collections import defaultdict
 
+try:
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:
+    from yaml import SafeLoader as _YamlLoader
+
 PATTERNS_DIR = "patterns"
 OUTPUT_FILENAME = "AVAILABLE_PATTERNS.md"
 
@@ -34,7 +39,7 @@ def discover_patterns():
                 file_path = os.path.join(root, filename)
                 try:
                     with open(file_path, 'r', encoding='utf-8') as f:
-                        data = yaml.safe_load(f)
+                        data = yaml.load(f, Loader=_YamlLoader)
                     
                     pattern_id = data.get("pattern_id", "N/A")
                     description = data.get("metadata", {}).get("description", "No description.").strip().split('\n')[0]
@@ -2,40 +2,193 @@
 Enhanced PLSEGenerator that integrates with the template-aware validation pipeline.
 """
 
+import os
+import sys
 import random
 import hashlib
-from typing import Optional, Tuple, Dict, Any, List
-from jinja2 import Environment, TemplateSyntaxError
+import functools
+from concurrent.futures import Executor
+from typing import Optional, Tuple, Dict, Any, List, Callable, Iterable
+from jinja2 import Environment, FileSystemBytecodeCache, Template, TemplateSyntaxError, nodes
 
 from .patterns import PLSEPattern
 from .validation import ValidationPipeline, ValidationResult
 
+# Deduplication is not security-sensitive, so a fast 64-bit non-cryptographic
+# hash is enough. xxh3 is preferred; blake2b truncated to 8 bytes is the
+# stdlib fallback.
+try:
+    import xxhash
+
+    def code_fingerprint(code: str) -> int:
+        """Returns a 64-bit fingerprint of `code` for duplicate detection."""
+        return xxhash.xxh3_64_intdigest(code.encode())
+except ImportError:
+    def code_fingerprint(code: str) -> int:
+        """Returns a 64-bit fingerprint of `code` for duplicate detection."""
+        return int.from_bytes(hashlib.blake2b(code.encode(), digest_size=8).digest(), "little")
+
+# A compiled template: takes the parameter context and returns rendered text.
+Renderer = Callable[[Dict[str, Any]], str]
+
+def _compile_substitution_renderer(env: Environment, source: str) -> Optional[Renderer]:
+    """
+    Specializes templates that are only literal text and `{{ name }}`
+    substitutions into a generated Python function that joins the pieces
+    directly, bypassing Jinja's runtime. Returns None for anything with
+    control flow, filters, attribute access or calls; those keep using Jinja.
+    """
+    try:
+        tree = env.parse(source)
+    except TemplateSyntaxError:
+        return None
+
+    pieces = []
+    for node in tree.body:
+        if not isinstance(node, nodes.Output):
+            return None
+        for child in node.nodes:
+            if isinstance(child, nodes.TemplateData):
+                pieces.append(repr(child.data))
+            elif isinstance(child, nodes.Const):
+                pieces.append(repr(str(child.value)))
+            elif isinstance(child, nodes.Name) and child.ctx == "load":
+                # Jinja renders undefined names as an empty string.
+                pieces.append(f"str(ctx.get({child.name!r}, ''))")
+            else:
+                return None
+
+    namespace: Dict[str, Any] = {}
+    exec(f"def _render(ctx):\n    return ''.join(({', '.join(pieces)},))\n", namespace)
+    return namespace["_render"]
+
+def _template_from_string(env: Environment, source: str) -> Template:
+    """
+    `env.from_string`, through the environment's bytecode cache if it has
+    one; from_string itself never consults the cache, only loaders do.
+    """
+    cache = env.bytecode_cache
+    if cache is None:
+        return env.from_string(source)
+    # Keyed by the source itself, so every distinct template gets its own entry.
+    bucket = cache.get_bucket(env, source, None, source)
+    code = bucket.code
+    if code is None:
+        code = env.compile(source)
+        bucket.code = code
+        try:
+            cache.set_bucket(bucket)
+        except OSError:
+            pass
+    return env.template_class.from_code(env, code, env.make_globals(None))
+
 class PLSEGenerator:
     """
     Generates Python code by rendering a PLSEPattern with a dynamically
     instantiated parameter context using the Jinja2 templating engine.
     Now with integrated validation.
     """
-    def __init__(self, validate: bool = True):
-        self.generated_hashes: set[str] = set()
-        self.jinja_env = Environment(trim_blocks=True, lstrip_blocks=True)
+    def __init__(self, validate: bool = True, patterns: Optional[Iterable[PLSEPattern]] = None,
+                 template_cache_dir: Optional[str] = None):
+        self.generated_hashes: set[int] = set()
+        # With a `template_cache_dir`, Jinja's compiled templates are kept on
+        # disk, so a new process loads them instead of compiling every pattern
+        # again; e.g. os.path.join(registry.CACHE_DIR, "templates").
+        bytecode_cache = None
+        if template_cache_dir:
+            os.makedirs(template_cache_dir, exist_ok=True)
+            bytecode_cache = FileSystemBytecodeCache(template_cache_dir)
+        self.jinja_env = Environment(trim_blocks=True, lstrip_blocks=True, bytecode_cache=bytecode_cache)
+        # Compiled renderers keyed by their source; pattern templates are
+        # fixed, so each one is parsed and compiled exactly once.
+        self._template_cache: Dict[str, Renderer] = {}
+        # The assembled full-code renderer for each pattern, keyed by pattern_id.
+        self._code_template_cache: Dict[str, Renderer] = {}
+        # Precomputed parameter samplers for each pattern, keyed by pattern_id.
+        self._sampler_cache: Dict[str, List[Tuple[str, Callable[[], Any]]]] = {}
         self.validate = validate
         if validate:
             self.validation_pipeline = ValidationPipeline()
+        for pattern in patterns or ():
+            self.prepare(pattern)
+
+    def prepare(self, pattern: PLSEPattern) -> None:
+        """
+        Compiles every renderer and parameter sampler the pattern needs, so
+        the first generate() call for it does no compilation. Templates that
+        fail to compile are left for generate() to report.
+        """
+        self._get_samplers(pattern)
+        try:
+            self._get_code_renderer(pattern)
+            self._get_renderer(pattern.instruction)
+            for test in pattern.validation.unit_test_snippets:
+                self._get_renderer(test)
+        except TemplateSyntaxError:
+            pass
+
+    def _get_renderer(self, source: str) -> Renderer:
+        """
+        Returns the compiled renderer for `source`, compiling it on first use.
+        Plain substitution templates get a specialized function; everything
+        else renders through Jinja.
+        """
+        renderer = self._template_cache.get(source)
+        if renderer is None:
+            renderer = _compile_substitution_renderer(self.jinja_env, source)
+            if renderer is None:
+                renderer = _template_from_string(self.jinja_env, source).render
+            self._template_cache[source] = renderer
+        return renderer
+
+    def _get_code_renderer(self, pattern: PLSEPattern) -> Renderer:
+        """
+        Returns the single compiled renderer for the pattern's full code,
+        assembling the component sources only the first time it is seen.
+        """
+        renderer = self._code_template_cache.get(pattern.pattern_id)
+        if renderer is None:
+            components = pattern.components
+            code_parts = filter(None, [
+                components.imports,
+                components.data_setup,
+                components.training_loop,
+                components.evaluation,
+                components.model_definition
+            ])
+            renderer = self._get_renderer("\n\n".join(code_parts))
+            self._code_template_cache[pattern.pattern_id] = renderer
+        return renderer
+
+    def _get_samplers(self, pattern: PLSEPattern) -> List[Tuple[str, Callable[[], Any]]]:
+        """
+        Resolves the pattern's parameter schema into (name, sampler) pairs once,
+        so per-call instantiation only invokes the samplers.
+        """
+        samplers = self._sampler_cache.get(pattern.pattern_id)
+        if samplers is None:
+            samplers = []
+            for name, param in (pattern.parameters or {}).items():
+                if param.type == "choice":
+                    options = param.constraints.get("options", [param.default]) if param.constraints else [param.default]
+                    pool = tuple(options)
+                else:
+                    pool = (param.default,)
+                # Sampled values and names end up in every render context, so
+                # share one interned copy of each across the whole batch.
+                pool = tuple(sys.intern(v) if isinstance(v, str) else v for v in pool)
+                name = sys.intern(name)
+                if len(pool) == 1:
+                    # Constant parameters (and single-option choices) skip the RNG.
+                    samplers.append((name, lambda value=pool[0]: value))
+                else:
+                    samplers.append((name, functools.partial(random.choice, pool)))
+            self._sampler_cache[pattern.pattern_id] = samplers
+        return samplers
 
     def _instantiate_parameters(self, pattern: PLSEPattern) -> Dict[str, Any]:
         """Generates a concrete set of values from the pattern's parameter schema."""
-        context = {}
-        if not pattern.parameters:
-            return context
-            
-        for name, param in pattern.parameters.items():
-            if param.type == "choice":
-                options = param.constraints.get("options", [param.default]) if param.constraints else [param.default]
-                context[name] = random.choice(options)
-            else:
-                context[name] = param.default
-        return context
+        return {name: sample() for name, sample in self._get_samplers(pattern)}
 
     def generate(self, pattern: PLSEPattern, skip_validation: bool = False) -> Optional[Tuple[str, str, List[str]]]:
         """
@@ -51,28 +204,23 @@ class PLSEGenerator:
         parameter_context = self._instantiate_parameters(pattern)
 
         try:
-            # Render the instruction separately
-            instruction_template = self.jinja_env.from_string(pattern.instruction)
-            rendered_instruction = instruction_template.render(parameter_context)
+            # Render the pre-assembled code template in a single pass
+            full_code = self._get_code_renderer(pattern)(parameter_context).strip()
 
-            # Assemble the full code template
-            components = pattern.components
-            code_parts = filter(None, [
-                components.imports,
-                components.data_setup,
-                components.training_loop,
-                components.evaluation,
-                components.model_definition
-            ])
-            full_template_str = "\n\n".join(code_parts)
+            # Check for uniqueness before rendering anything else, so
+            # duplicates cost one render and one hash.
+            if not full_code:
+                return None
+            code_hash = code_fingerprint(full_code)
+            if code_hash in self.generated_hashes:
+                return None
 
-            # Render the assembled template
-            code_template = self.jinja_env.from_string(full_template_str)
-            full_code = code_template.render(parameter_context).strip()
+            # Render the instruction separately
+            rendered_instruction = self._get_renderer(pattern.instruction)(parameter_context)
 
             # Render the validation snippets
             rendered_tests = [
-                self.jinja_env.from_string(test).render(parameter_context)
+                self._get_renderer(test)(parameter_context)
                 for test in pattern.validation.unit_test_snippets
             ]
 
@@ -83,12 +231,6 @@ class PLSEGenerator:
             print(f"Unexpected generation error in '{pattern.pattern_id}': {type(e).__name__}: {e}")
             return None
 
-        # Check for uniqueness
-        if not full_code:
-            return None
-        code_hash = hashlib.md5(full_code.encode()).hexdigest()
-        if code_hash in self.generated_hashes:
-            return None
         self.generated_hashes.add(code_hash)
 
         # NEW: Optional validation of generated code
@@ -106,7 +248,8 @@ class PLSEGenerator:
         return full_code, rendered_instruction, rendered_tests
 
     def generate_batch(self, pattern: PLSEPattern, count: int = 10, 
-                      validate_sample: bool = True) -> List[Tuple[str, str, List[str]]]:
+                      validate_sample: bool = True,
+                      executor: Optional[Executor] = None) -> List[Tuple[str, str, List[str]]]:
         """
         Generate multiple unique samples from a pattern.
         
@@ -114,10 +257,16 @@ class PLSEGenerator:
             pattern: The PLSEPattern to generate from
             count: Number of samples to attempt generating
             validate_sample: If True, validates the first sample only (for speed)
+            executor: Optional process pool. When given, the attempts are split
+                      into chunks rendered by the pool's workers, and duplicates
+                      are filtered here against this generator's hashes.
         
         Returns:
             List of (code, instruction, tests) tuples
         """
+        if executor is not None:
+            return self._generate_batch_parallel(pattern, count, validate_sample, executor)
+
         samples = []
         
         for i in range(count):
@@ -128,4 +277,41 @@ class PLSEGenerator:
             if result:
                 samples.append(result)
         
-        return samples
\ No newline at end of file
+        return samples
+
+    def _generate_batch_parallel(self, pattern: PLSEPattern, count: int,
+                                 validate_sample: bool, executor: Executor) -> List[Tuple[str, str, List[str]]]:
+        """Fans generate_batch out over `executor` and deduplicates the results."""
+        num_chunks = min(count, os.cpu_count() or 1)
+        chunk_sizes = [count // num_chunks + (1 if i < count % num_chunks else 0) for i in range(num_chunks)]
+        futures = [
+            # Only the first chunk validates its first sample, as in the serial path
+            executor.submit(_generate_batch_in_worker, pattern, size, self.validate, validate_sample and i == 0)
+            for i, size in enumerate(chunk_sizes)
+        ]
+
+        samples = []
+        for future in futures:
+            for code_hash, sample in future.result():
+                if code_hash in self.generated_hashes:
+                    continue
+                self.generated_hashes.add(code_hash)
+                samples.append(sample)
+        return samples
+
+
+@functools.lru_cache(maxsize=None)
+def _worker_generator(validate: bool) -> PLSEGenerator:
+    """Per-process generator for pool workers, so compiled templates persist across tasks."""
+    return PLSEGenerator(validate=validate)
+
+# This function must be at the top level to be pickleable by multiprocessing
+def _generate_batch_in_worker(pattern: PLSEPattern, count: int, validate: bool,
+                              validate_sample: bool) -> List[Tuple[int, Tuple[str, str, List[str]]]]:
+    """Renders a chunk of samples in a worker and returns them with their fingerprints."""
+    generator = _worker_generator(validate)
+    # The generator outlives the call; deduplication is the parent's job, and
+    # hashes kept from earlier calls would only grow and drop fresh samples.
+    generator.generated_hashes.clear()
+    samples = generator.generate_batch(pattern, count=count, validate_sample=validate_sample)
+    return [(code_fingerprint(sample[0]), sample) for sample in samples]
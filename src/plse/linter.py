@@ -5,12 +5,21 @@ This linter can differentiate between legitimate Jinja2 template variables
 and actual undefined Python variables.
 """
 
+import ast
+import builtins
 import libcst as cst
 import re
 from dataclasses import dataclass
-from typing import List, Type, Set, Optional
+from typing import List, Type, Set, Optional, Union
 
-@dataclass
+# Python builtins that should always be considered defined. Computed once;
+# `builtins` is used rather than `__builtins__`, which is a dict in modules.
+_PY_BUILTINS: frozenset = frozenset(dir(builtins))
+
+# Matches Jinja2 variable expressions such as {{ var_name }}.
+_JINJA_VAR_RE = re.compile(r'\{\{\s*(\w+)\s*\}\}')
+
+@dataclass(slots=True, frozen=True)
 class LintViolation:
     """Represents a single violation found by a linter rule."""
     line: int
@@ -18,12 +27,26 @@ class LintViolation:
     code: str
     message: str
 
-class BaseLinterRule(cst.CSTVisitor):
-    """Abstract base class for all linter rules."""
+class BaseLinterRule(cst.BatchableCSTVisitor):
+    """
+    Abstract base class for linter rules that need the concrete syntax tree.
+    Rules are batchable so that CustomLinter can run all of them in a single
+    traversal of the tree.
+    """
+    AST_FAST_PATH = False
+    # Optional compiled regex; if set, the rule can only fire on code it matches.
+    PREFILTER: Optional["re.Pattern[str]"] = None
+    METADATA_DEPENDENCIES = (cst.metadata.PositionProvider,)
+
     def __init__(self, template_vars: Optional[Set[str]] = None):
         self.violations: List[LintViolation] = []
         self.template_vars = template_vars or set()
 
+    def reset(self, template_vars: Optional[Set[str]] = None) -> None:
+        """Clears per-run state so the same rule instance can lint another module."""
+        self.violations.clear()
+        self.template_vars = template_vars or set()
+
     def add_violation(self, node: cst.CSTNode, code: str, message: str):
         """Adds a violation at the location of the given CST node."""
         location = cst.ensure_type(
@@ -39,13 +62,51 @@ class BaseLinterRule(cst.CSTVisitor):
             )
         )
 
-class NoWildcardImportRule(BaseLinterRule):
+class BaseAstLinterRule(ast.NodeVisitor):
+    """
+    Abstract base class for read-only rules that only inspect node types,
+    names and positions. These run on the stdlib `ast` parser, which is
+    implemented in C and much cheaper than building a libcst tree.
+    """
+    AST_FAST_PATH = True
+    # Optional compiled regex; if set, the rule can only fire on code it matches.
+    PREFILTER: Optional["re.Pattern[str]"] = None
+
+    def __init__(self, template_vars: Optional[Set[str]] = None):
+        self.violations: List[LintViolation] = []
+        self.template_vars = template_vars or set()
+
+    def reset(self, template_vars: Optional[Set[str]] = None) -> None:
+        """Clears per-run state so the same rule instance can lint another module."""
+        self.violations.clear()
+        self.template_vars = template_vars or set()
+
+    def add_violation(self, node: ast.AST, code: str, message: str):
+        """Adds a violation at the location of the given AST node."""
+        self.violations.append(
+            LintViolation(
+                line=node.lineno,
+                column=node.col_offset,
+                code=code,
+                message=message
+            )
+        )
+
+class NoWildcardImportRule(BaseAstLinterRule):
     """Flags the use of 'from module import *'."""
     VIOLATION_CODE = "PLSE101"
     VIOLATION_MESSAGE = "Wildcard import `*` is discouraged."
+    # Deliberately loose (also matches comments and strings) so that it never
+    # rejects a real wildcard import; backslashes are allowed before the `*`
+    # for imports continued onto the next line. No leading \b: a pattern that
+    # starts with a literal lets `re` scan for that literal, which is some 30x
+    # faster than testing a word boundary at every offset.
+    PREFILTER = re.compile(r'import[\s\\]*\*')
 
-    def visit_ImportStar(self, node: cst.ImportStar) -> None:
-        self.add_violation(node, self.VIOLATION_CODE, self.VIOLATION_MESSAGE)
+    def visit_ImportFrom(self, node: ast.ImportFrom) -> None:
+        for alias in node.names:
+            if alias.name == "*":
+                self.add_violation(alias, self.VIOLATION_CODE, self.VIOLATION_MESSAGE)
 
 class UndefinedNameRule(BaseLinterRule):
     """
@@ -53,13 +114,18 @@ class UndefinedNameRule(BaseLinterRule):
     This replaces the need for F821 checking from flake8.
     """
     VIOLATION_CODE = "PLSE201"
+    METADATA_DEPENDENCIES = (cst.metadata.PositionProvider, cst.metadata.ParentNodeProvider)
     
     def __init__(self, template_vars: Optional[Set[str]] = None):
         super().__init__(template_vars)
         self.defined_names: Set[str] = set()
         self.used_names: Set[str] = set()
-        # Python builtins that should always be considered defined
-        self.builtins = set(dir(__builtins__))
+        self.builtins = _PY_BUILTINS
+
+    def reset(self, template_vars: Optional[Set[str]] = None) -> None:
+        super().reset(template_vars)
+        self.defined_names.clear()
+        self.used_names.clear()
     
     def visit_Name(self, node: cst.Name) -> None:
         """Track all name references."""
@@ -71,7 +137,8 @@ class UndefinedNameRule(BaseLinterRule):
             if isinstance(parent, (cst.AssignTarget, cst.Param, cst.FunctionDef, cst.ClassDef)):
                 self.defined_names.add(name)
                 return
-        except:
+        except KeyError:
+            # No parent recorded for this node
             pass
         
         # Track as a usage
@@ -118,18 +185,31 @@ class UndefinedNameRule(BaseLinterRule):
         # For simplicity, we're not adding violations here in this example
         pass
 
+LinterRule = Union[BaseLinterRule, BaseAstLinterRule]
+
 class CustomLinter:
     """
-    Parses Python code into a Concrete Syntax Tree (CST) and runs a suite
-    of custom linter rules over it. Now with template-awareness!
+    Parses Python code and runs a suite of custom linter rules over it.
+    Rules marked AST_FAST_PATH run on the stdlib `ast`; the Concrete Syntax
+    Tree (CST) is only built when a rule needs it. Now with template-awareness!
     """
     def __init__(self, template_vars: Optional[Set[str]] = None):
         self.template_vars = template_vars or set()
-        self.rules: List[Type[BaseLinterRule]] = [
+        self.rules: List[Type[LinterRule]] = [
             NoWildcardImportRule,
             # UndefinedNameRule is commented out for now - needs more sophisticated implementation
             # UndefinedNameRule,
         ]
+        # Rule visitors are built once and reset before each run.
+        self._rule_instances: List[LinterRule] = [RuleClass() for RuleClass in self.rules]
+        self._ast_rules = [rule for rule in self._rule_instances if rule.AST_FAST_PATH]
+        self._cst_rules = [rule for rule in self._rule_instances if not rule.AST_FAST_PATH]
+        # When every rule has a prefilter, code matching none of them cannot
+        # produce a violation and is never parsed.
+        if all(rule.PREFILTER is not None for rule in self._rule_instances):
+            self._prefilters = [rule.PREFILTER for rule in self._rule_instances]
+        else:
+            self._prefilters = None
 
     @staticmethod
     def extract_template_vars(code: str) -> Set[str]:
@@ -137,11 +217,19 @@ class CustomLinter:
         Extracts Jinja2 template variable names from code.
         Looks for patterns like {{ var_name }}.
         """
-        pattern = r'\{\{\s*(\w+)\s*\}\}'
-        matches = re.findall(pattern, code)
-        return set(matches)
+        return set(_JINJA_VAR_RE.findall(code))
 
-    def run(self, code: str, known_template_vars: Optional[Set[str]] = None) -> List[LintViolation]:
+    def needs_ast(self, code: str) -> bool:
+        """
+        Whether `run` would parse the code with `ast`. Callers that parse it
+        anyway can pass their tree to `run` instead.
+        """
+        if not self._ast_rules:
+            return False
+        return self._prefilters is None or any(p.search(code) for p in self._prefilters)
+
+    def run(self, code: str, known_template_vars: Optional[Set[str]] = None,
+            tree: Optional[ast.Module] = None) -> List[LintViolation]:
         """
         Parses and lints the given code, returning all violations.
         
@@ -149,24 +237,43 @@ class CustomLinter:
             code: The Python/Jinja2 template code to lint
             known_template_vars: Optional set of known template variable names
                                 If not provided, will be extracted from the code
+            tree: Optional `ast` tree of the code, used instead of parsing it again
         """
+        if self._prefilters is not None and not any(p.search(code) for p in self._prefilters):
+            return []
+
         # Extract or use provided template variables
         if known_template_vars is None:
             template_vars = self.extract_template_vars(code)
         else:
             template_vars = known_template_vars.union(self.extract_template_vars(code))
         
-        try:
-            source_tree = cst.parse_module(code)
-            wrapper = cst.MetadataWrapper(source_tree)
-        except Exception as e:
-            # If parsing fails, it's a syntax error handled elsewhere
-            return []
+        for visitor in self._rule_instances:
+            visitor.reset(template_vars)
+
+        if self._ast_rules:
+            if tree is None:
+                try:
+                    tree = ast.parse(code)
+                except (SyntaxError, ValueError):
+                    # If parsing fails, it's a syntax error handled elsewhere
+                    return []
+            for visitor in self._ast_rules:
+                visitor.visit(tree)
+
+        if self._cst_rules:
+            try:
+                source_tree = cst.parse_module(code)
+                # The tree was just parsed and is not shared, so the defensive deep copy is unnecessary.
+                wrapper = cst.MetadataWrapper(source_tree, unsafe_skip_copy=True)
+            except Exception as e:
+                # If parsing fails, it's a syntax error handled elsewhere
+                return []
+            # One traversal dispatches to every rule; metadata is resolved once for all of them.
+            wrapper.visit_batched(self._cst_rules)
 
         all_violations: List[LintViolation] = []
-        for RuleClass in self.rules:
-            visitor = RuleClass(template_vars=template_vars)
-            wrapper.visit(visitor)
+        for visitor in self._rule_instances:
             all_violations.extend(visitor.violations)
             
         return all_violations
@@ -2,32 +2,38 @@
 Defines the internal dataclasses used by the PLSE application.
 """
 
+import sys
 from dataclasses import dataclass, field
-from typing import Dict, List, Any, Optional
+from typing import Annotated, Dict, Tuple, Any, Optional
+from pydantic import AfterValidator
 
 from .schema import PLSEPatternSchema
 
-@dataclass
+# Low-cardinality strings that repeat across the library. Interned when the
+# registry validates straight into these dataclasses; plain `str` otherwise.
+InternedStr = Annotated[str, AfterValidator(sys.intern)]
+
+@dataclass(slots=True, frozen=True)
 class Pedagogy:
     concept: str
-    difficulty: str
-    related_patterns: List[str] = field(default_factory=list)
+    difficulty: InternedStr
+    related_patterns: Tuple[InternedStr, ...] = ()
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class Metadata:
-    author: str
+    author: InternedStr
     description: str
-    tags: List[str]
+    tags: Tuple[InternedStr, ...]
     pedagogy: Pedagogy
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class Parameter:
     type: str
     description: str
     default: Any
     constraints: Optional[Dict[str, Any]] = None
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class Components:
     imports: str = ""
     model_definition: Optional[str] = None
@@ -35,47 +41,74 @@ class Components:
     training_loop: Optional[str] = None
     evaluation: Optional[str] = None
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class Validation:
     linter_checks: bool = True
-    unit_test_snippets: List[str] = field(default_factory=list)
+    unit_test_snippets: Tuple[str, ...] = ()
     expected_output: Optional[Dict[str, Any]] = None
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class PLSEPattern:
     """The internal, validated representation of a single PLSE pattern."""
     plse_version: str
-    pattern_id: str
+    pattern_id: InternedStr
     metadata: Metadata
     instruction: str
     components: Components
     parameters: Dict[str, Parameter] = field(default_factory=dict)
     validation: Validation = field(default_factory=Validation)
-    requires: List[str] = field(default_factory=list)
+    requires: Tuple[str, ...] = ()
 
     @classmethod
     def from_schema(cls, schema: PLSEPatternSchema) -> "PLSEPattern":
-        pedagogy_obj = Pedagogy(**schema.metadata.pedagogy.model_dump())
+        # Fields are read straight off the validated models rather than
+        # round-tripping each submodel through model_dump() and ** unpacking.
+        # Low-cardinality strings repeated across the library are interned.
+        pedagogy = schema.metadata.pedagogy
+        pedagogy_obj = Pedagogy(
+            concept=pedagogy.concept,
+            difficulty=sys.intern(pedagogy.difficulty),
+            related_patterns=tuple(sys.intern(p) for p in pedagogy.related_patterns)
+        )
         metadata_obj = Metadata(
-            author=schema.metadata.author,
+            author=sys.intern(schema.metadata.author),
             description=schema.metadata.description,
-            tags=schema.metadata.tags,
+            tags=tuple(sys.intern(t) for t in schema.metadata.tags),
             pedagogy=pedagogy_obj
         )
         params_obj = {
-            name: Parameter(**p_data.model_dump())
+            name: Parameter(
+                type=p_data.type,
+                description=p_data.description,
+                default=p_data.default,
+                constraints=p_data.constraints
+            )
             for name, p_data in schema.parameters.items()
         } if schema.parameters else {}
-        components_obj = Components(**schema.components.model_dump())
-        validation_obj = Validation(**schema.validation.model_dump()) if schema.validation else Validation()
+        components = schema.components
+        components_obj = Components(
+            imports=components.imports,
+            model_definition=components.model_definition,
+            data_setup=components.data_setup,
+            training_loop=components.training_loop,
+            evaluation=components.evaluation
+        )
+        if schema.validation:
+            validation_obj = Validation(
+                linter_checks=schema.validation.linter_checks,
+                unit_test_snippets=tuple(schema.validation.unit_test_snippets),
+                expected_output=schema.validation.expected_output
+            )
+        else:
+            validation_obj = Validation()
 
         return cls(
             plse_version=schema.plse_version,
-            pattern_id=schema.pattern_id,
+            pattern_id=sys.intern(schema.pattern_id),
             metadata=metadata_obj,
             instruction=schema.instruction,
             components=components_obj,
             parameters=params_obj,
             validation=validation_obj,
-            requires=schema.requires or []
-        )
\ No newline at end of file
+            requires=tuple(schema.requires or ())
+        )
@@ -3,25 +3,175 @@ Discovers, validates, and loads all PLSE patterns from a directory tree.
 """
 
 import os
+import re
+import mmap
 import yaml
+import pickle
 import random
-from typing import List, Optional
-from pydantic import ValidationError
+import hashlib
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterator, List, Optional, Tuple
+from pydantic import TypeAdapter, ValidationError
 
-from .schema import PLSEPatternSchema
+from . import schema as _schema_module, patterns as _patterns_module
+from .schema import normalize_pattern_data
 from .patterns import PLSEPattern
 
+# Prefer the libyaml-backed loader; it accepts the same documents as
+# SafeLoader and is many times faster.
+try:
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:
+    from yaml import SafeLoader as _YamlLoader
+
+_YAML_SUFFIXES = (".yaml", ".yml")
+
+# Validates raw pattern mappings straight into the PLSEPattern dataclasses,
+# so loading builds no intermediate PLSEPatternSchema or dumped dicts.
+_PATTERN_ADAPTER = TypeAdapter(PLSEPattern)
+
+# A top-level `pattern_id: value` line, optionally quoted. Lazy registries
+# index files with this instead of parsing them.
+_PATTERN_ID_RE = re.compile(rb'^pattern_id:[ \t]*["\']?([^"\'\s#]+)', re.MULTILINE)
+
+# Where `PatternRegistry(cache=True)` keeps pickled load results.
+CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "plse")
+
+def _iter_yaml_files(root: str) -> Iterator[str]:
+    """
+    Yields YAML file paths under `root`, in the same top-down order as
+    `os.walk`. Uses `os.scandir` directly so file/dir checks reuse the type
+    information returned with each directory entry instead of an extra stat.
+    """
+    stack = [root]
+    while stack:
+        subdirs = []
+        try:
+            entries = os.scandir(stack.pop())
+        except OSError:
+            # As `os.walk` does: skip directories that cannot be read.
+            continue
+        with entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    subdirs.append(entry.path)
+                elif entry.name.endswith(_YAML_SUFFIXES):
+                    yield entry.path
+        stack.extend(reversed(subdirs))
+
+def _cache_path(file_paths: List[str]) -> str:
+    """
+    Returns the cache file for this exact set of pattern files. The key
+    covers each file's path, mtime and size, plus the modules defining the
+    schema and the pickled dataclasses, so any change means a fresh load.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    for path in [_schema_module.__file__, _patterns_module.__file__, *file_paths]:
+        st = os.stat(path)
+        digest.update(f"{os.path.abspath(path)}\0{st.st_mtime_ns}\0{st.st_size}\n".encode())
+    return os.path.join(CACHE_DIR, f"registry-{digest.hexdigest()}.pkl")
+
+def _load_pattern_file(file_path: str) -> Tuple[Optional[PLSEPattern], bool]:
+    """
+    Parses and validates a single pattern file. Returns (pattern, failed);
+    pattern is None for empty or non-mapping files as well as on failure.
+    Module-level so that it can be shipped to worker processes.
+    """
+    try:
+        with open(file_path, 'rb') as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                # Empty files cannot be mapped.
+                return None, False
+            # The loader reads straight from the mapped pages (libyaml decodes
+            # the UTF-8 itself), so no intermediate text buffer is built.
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                raw_data = yaml.load(mm, Loader=_YamlLoader)
+        
+        if not isinstance(raw_data, dict):
+            # Skip empty or invalid files
+            return None, False
+
+        return _PATTERN_ADAPTER.validate_python(normalize_pattern_data(raw_data)), False
+    except ValidationError as e:
+        # ... error handling ...
+        return None, True
+    except Exception as e:
+        # ... error handling ...
+        return None, True
+
+def _scan_pattern_id(file_path: str) -> Optional[str]:
+    """
+    Returns the top-level pattern_id declared in a pattern file without
+    parsing the YAML, or None if no such line is found.
+    """
+    with open(file_path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return None
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            match = _PATTERN_ID_RE.search(mm)
+            # The match refers into the map, so extract before it closes.
+            return match.group(1).decode('utf-8') if match else None
+
 class PatternRegistry:
     """
     Scans a directory recursively, validates YAML files against the Pydantic
     schema, and loads them into memory as PLSEPattern objects.
     """
-    def __init__(self, patterns_dir: str):
+    def __init__(self, patterns_dir: str, max_workers: Optional[int] = None, cache: bool = False,
+                 rng: Optional[random.Random] = None, lazy: bool = False):
+        """
+        Args:
+            patterns_dir: Root directory to scan for pattern YAML files.
+            max_workers: If greater than 1, files are parsed and validated in
+                         a process pool of this size. Loading is serial by
+                         default, since pool start-up outweighs the parsing
+                         cost for small registries.
+            cache: If True, load results are pickled under CACHE_DIR and
+                   reused while no pattern file has changed.
+            rng: Generator used by `get_random`. Defaults to the module-level
+                 one so `random.seed()` still applies; pass a dedicated
+                 `random.Random` to keep threads from sharing its state.
+            lazy: If True, only index files by pattern_id at start-up. `get`
+                  then parses a single file on demand, and the full load is
+                  deferred until `patterns` (or anything needing all of them,
+                  such as `get_random` or iteration) is first used.
+        """
         if not os.path.isdir(patterns_dir):
             raise FileNotFoundError(f"The specified patterns directory does not exist: {patterns_dir}")
         self.patterns_dir = patterns_dir
-        self.patterns: List[PLSEPattern] = []
-        self._load_patterns()
+        self.max_workers = max_workers
+        self.cache = cache
+        # Bound once so `get_random` does no attribute lookups per call.
+        self._choice = (rng if rng is not None else random).choice
+        self._patterns: Optional[List[PLSEPattern]] = None
+        # Patterns eligible for `get_random`; shrinks as patterns are disabled.
+        self._active: List[PLSEPattern] = []
+        self._by_id: Dict[str, PLSEPattern] = {}
+        # pattern_id -> file path, filled by the lazy index.
+        self._paths: Dict[str, str] = {}
+        if lazy:
+            self._index_patterns()
+        else:
+            self._load_patterns()
+
+    @property
+    def patterns(self) -> List[PLSEPattern]:
+        """All loaded patterns, loading them first if the registry is lazy."""
+        if self._patterns is None:
+            self._load_patterns()
+        return self._patterns
+
+    def _index_patterns(self):
+        """Maps pattern ids to files without parsing or validating them."""
+        print(f"🔍 Indexing patterns in '{self.patterns_dir}' and its subdirectories...")
+        for file_path in _iter_yaml_files(self.patterns_dir):
+            try:
+                pattern_id = _scan_pattern_id(file_path)
+            except OSError:
+                continue
+            if pattern_id is not None:
+                self._paths.setdefault(pattern_id, file_path)
+        print(f"✅ Indexed {len(self._paths)} pattern files; they will be loaded on demand.")
 
     def _load_patterns(self):
         # ... (this method is correct and does not need changes) ...
@@ -29,42 +179,96 @@ class PatternRegistry:
         loaded_count = 0
         error_count = 0
 
-        for root, _, files in os.walk(self.patterns_dir):
-            for filename in files:
-                if filename.endswith((".yaml", ".yml")):
-                    file_path = os.path.join(root, filename)
-                    try:
-                        with open(file_path, 'r', encoding='utf-8') as f:
-                            raw_data = yaml.safe_load(f)
-                        
-                        if not isinstance(raw_data, dict):
-                            # Skip empty or invalid files
-                            continue
-
-                        validated_schema = PLSEPatternSchema(**raw_data)
-                        pattern = PLSEPattern.from_schema(validated_schema)
-                        
-                        self.patterns.append(pattern)
-                        loaded_count += 1
-                    except ValidationError as e:
-                        # ... error handling ...
-                        error_count += 1
-                    except Exception as e:
-                        # ... error handling ...
-                        error_count += 1
+        file_paths = list(_iter_yaml_files(self.patterns_dir))
+        cache_path = _cache_path(file_paths) if self.cache else None
+        results = self._read_cache(cache_path) if cache_path else None
+        if results is None:
+            results = self._parse_files(file_paths)
+            if cache_path:
+                self._write_cache(cache_path, results)
+
+        # Results keep discovery order regardless of how they were produced.
+        patterns: List[PLSEPattern] = []
+        for pattern, failed in results:
+            if failed:
+                error_count += 1
+            elif pattern is not None:
+                patterns.append(pattern)
+                loaded_count += 1
+        self._patterns = patterns
+        self._active = list(patterns)
+        self._by_id = {}
+        for pattern in patterns:
+            self._by_id.setdefault(pattern.pattern_id, pattern)
         
         print(f"\n✅ Scan complete. Loaded {loaded_count} patterns.")
         if error_count > 0:
             print(f"⚠️ Encountered {error_count} errors during loading.")
 
+    def _parse_files(self, file_paths: List[str]) -> List[Tuple[Optional[PLSEPattern], bool]]:
+        """Runs `_load_pattern_file` over every path, in a pool if configured."""
+        if self.max_workers and self.max_workers > 1 and len(file_paths) > 1:
+            chunksize = max(1, len(file_paths) // (self.max_workers * 4))
+            with ProcessPoolExecutor(max_workers=self.max_workers) as executor:
+                return list(executor.map(_load_pattern_file, file_paths, chunksize=chunksize))
+        return [_load_pattern_file(file_path) for file_path in file_paths]
+
+    @staticmethod
+    def _read_cache(cache_path: str) -> Optional[List[Tuple[Optional[PLSEPattern], bool]]]:
+        try:
+            with open(cache_path, 'rb') as f:
+                return pickle.load(f)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            # A corrupt or incompatible cache is just a miss.
+            print(f"⚠️ Ignoring unreadable pattern cache '{cache_path}': {e}")
+            return None
+
+    @staticmethod
+    def _write_cache(cache_path: str, results: List[Tuple[Optional[PLSEPattern], bool]]):
+        try:
+            os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+            # Write then rename so concurrent loaders never see a partial file.
+            tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+            with open(tmp_path, 'wb') as f:
+                pickle.dump(results, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, cache_path)
+        except OSError as e:
+            print(f"⚠️ Could not write pattern cache '{cache_path}': {e}")
+
+    def get(self, pattern_id: str) -> Optional[PLSEPattern]:
+        """
+        Returns the pattern with the given id, or None. On a lazy registry
+        that has not been fully loaded, only that pattern's file is parsed.
+        """
+        pattern = self._by_id.get(pattern_id)
+        if pattern is None and self._patterns is None:
+            file_path = self._paths.get(pattern_id)
+            if file_path is not None:
+                pattern, _ = _load_pattern_file(file_path)
+                if pattern is not None:
+                    self._by_id[pattern_id] = pattern
+        return pattern
 
     def get_random(self) -> Optional[PLSEPattern]:
         """
         Returns a random pattern from the registry.
         """
-        if not self.patterns:
+        if self._patterns is None:
+            self._load_patterns()
+        if not self._active:
             return None
-        return random.choice(self.patterns)
+        return self._choice(self._active)
+
+    def disable(self, pattern_id: str) -> None:
+        """
+        Removes a pattern from `get_random` rotation. It remains in
+        `patterns` and is still visible when iterating the registry.
+        """
+        if self._patterns is None:
+            self._load_patterns()
+        self._active = [p for p in self._active if p.pattern_id != pattern_id]
 
     # --- FIX: Add the missing __len__ method ---
     def __len__(self) -> int:
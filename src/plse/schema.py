@@ -46,13 +46,28 @@ class PLSEPatternSchema(BaseModel):
     validation: Optional[ValidationSchema] = None
     requires: Optional[List[str]] = None
 
-    @model_validator(mode='after')
-    def check_components_or_template(self) -> 'PLSEPatternSchema':
-        if self.components is None and self.template is None:
-            raise ValueError("A pattern must have either a 'components' map or a 'template' string.")
-        if self.components is not None and self.template is not None:
-            raise ValueError("A pattern cannot have both 'components' and 'template'.")
-        if self.template is not None:
-            self.components = ComponentsSchema(model_definition=self.template)
-            self.template = None
-        return self
\ No newline at end of file
+    @model_validator(mode='before')
+    @classmethod
+    def check_components_or_template(cls, data: Any) -> Any:
+        if isinstance(data, dict):
+            return normalize_pattern_data(data)
+        return data
+
+def normalize_pattern_data(data: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Applies the cross-field rules of a raw pattern mapping: exactly one of
+    'components' or 'template' must be present, and a template is folded into
+    components.model_definition. Optional keys explicitly set to null are
+    dropped so their defaults apply. Returns a new dict.
+    """
+    if data.get("components") is None and data.get("template") is None:
+        raise ValueError("A pattern must have either a 'components' map or a 'template' string.")
+    if data.get("components") is not None and data.get("template") is not None:
+        raise ValueError("A pattern cannot have both 'components' and 'template'.")
+    data = {key: value for key, value in data.items() if value is not None or key not in _NULLABLE_FIELDS}
+    template = data.pop("template", None)
+    if template is not None:
+        data["components"] = {"model_definition": template}
+    return data
+
+_NULLABLE_FIELDS = frozenset({"components", "template", "parameters", "validation", "requires"})
@@ -7,8 +7,9 @@ Tests that patterns can be rendered with default parameters and pass validation.
 import os
 import sys
 from pathlib import Path
-from typing import Dict, List
-from collections import defaultdict
+from typing import Dict, List, Optional, Tuple
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
 
 # Add project root to path if needed
 # sys.path.insert(0, str(Path(__file__).parent.parent))
@@ -17,11 +18,78 @@ from plse.registry import PatternRegistry
 from plse.generator import PLSEGenerator
 from plse.validation import ValidationPipeline
 
+def _categorize_error(error: str) -> str:
+    """Buckets a validation error message for the summary breakdown."""
+    if 'F821' in error or 'undefined' in error.lower():
+        return 'F821_undefined'
+    elif 'Syntax' in error:
+        return 'syntax'
+    elif 'Linter' in error:
+        return 'linter'
+    elif 'execution' in error.lower():
+        return 'execution'
+    return 'other'
+
+def _check_pattern(generator: PLSEGenerator, pipeline: ValidationPipeline, pattern) -> Tuple[Dict, Counter]:
+    """
+    Renders one sample of `pattern` and validates it. Returns the result
+    dict and the error-type counts it contributes to the summary.
+    """
+    result = {
+        'pattern_id': pattern.pattern_id,
+        'status': 'unknown',
+        'errors': [],
+    }
+    error_types = Counter()
+    
+    try:
+        # Generate one sample with default parameters
+        sample = generator.generate(pattern, skip_validation=True)
+        
+        if sample is None:
+            result['status'] = 'failed'
+            result['errors'].append("Generation failed (returned None)")
+            return result, error_types
+        
+        code, instruction, tests = sample
+        
+        # Now validate the rendered code (without parameters, since it's already rendered)
+        validation_result = pipeline.validate(code=code, tests=tests)
+        
+        if validation_result.valid:
+            result['status'] = 'passed'
+        else:
+            result['status'] = 'failed'
+            result['errors'] = list(validation_result.errors)
+            
+            # Categorize errors
+            error_types.update(_categorize_error(error) for error in validation_result.errors)
+    
+    except Exception as e:
+        result['status'] = 'failed'
+        result['errors'].append(f"Unexpected error: {type(e).__name__}: {str(e)}")
+        error_types['exception'] += 1
+    
+    return result, error_types
+
+# Per-process generator and pipeline, built once by `_init_worker`.
+_WORKER_STATE: Dict = {}
+
+def _init_worker():
+    _WORKER_STATE['generator'] = PLSEGenerator(validate=False)
+    _WORKER_STATE['pipeline'] = ValidationPipeline()
+
+def _check_pattern_in_worker(pattern) -> Tuple[Dict, Counter]:
+    return _check_pattern(_WORKER_STATE['generator'], _WORKER_STATE['pipeline'], pattern)
+
 class QuickPatternValidator:
     """Validates all patterns by attempting to generate and validate samples."""
     
-    def __init__(self, patterns_dir: str):
+    def __init__(self, patterns_dir: str, max_workers: Optional[int] = None):
         self.patterns_dir = Path(patterns_dir)
+        # Patterns are independent, so validate_all fans out across processes.
+        # Use max_workers=1 to validate serially in this process.
+        self.max_workers = max_workers or os.cpu_count() or 1
         self.registry = PatternRegistry(str(patterns_dir))
         self.generator = PLSEGenerator(validate=False)  # We'll validate manually
         self.pipeline = ValidationPipeline()
@@ -30,76 +98,45 @@ class QuickPatternValidator:
             'passed': [],
             'failed': [],
         }
-        self.error_types = defaultdict(int)
+        self.error_types = Counter()
     
     def validate_pattern_rendering(self, pattern) -> Dict:
         """
         Validate that a pattern can be rendered and validated successfully.
         Tests with default parameter values.
         """
-        result = {
-            'pattern_id': pattern.pattern_id,
-            'status': 'unknown',
-            'errors': [],
-        }
-        
-        try:
-            # Generate one sample with default parameters
-            sample = self.generator.generate(pattern, skip_validation=True)
-            
-            if sample is None:
-                result['status'] = 'failed'
-                result['errors'].append("Generation failed (returned None)")
-                return result
-            
-            code, instruction, tests = sample
-            
-            # Now validate the rendered code (without parameters, since it's already rendered)
-            validation_result = self.pipeline.validate(code=code, tests=tests)
-            
-            if validation_result.valid:
-                result['status'] = 'passed'
-            else:
-                result['status'] = 'failed'
-                result['errors'] = validation_result.errors
-                
-                # Categorize errors
-                for error in validation_result.errors:
-                    if 'F821' in error or 'undefined' in error.lower():
-                        self.error_types['F821_undefined'] += 1
-                    elif 'Syntax' in error:
-                        self.error_types['syntax'] += 1
-                    elif 'Linter' in error:
-                        self.error_types['linter'] += 1
-                    elif 'execution' in error.lower():
-                        self.error_types['execution'] += 1
-                    else:
-                        self.error_types['other'] += 1
-        
-        except Exception as e:
-            result['status'] = 'failed'
-            result['errors'].append(f"Unexpected error: {type(e).__name__}: {str(e)}")
-            self.error_types['exception'] += 1
-        
+        result, error_types = _check_pattern(self.generator, self.pipeline, pattern)
+        self.error_types.update(error_types)
         return result
     
     def validate_all(self) -> Dict:
         """Validate all patterns in the registry."""
         print(f"🔍 Found {len(self.registry)} patterns to validate\n")
         
-        for i, pattern in enumerate(self.registry, 1):
-            print(f"[{i}/{len(self.registry)}] Validating {pattern.pattern_id}...", end=" ")
-            
-            result = self.validate_pattern_rendering(pattern)
-            
-            if result['status'] == 'passed':
-                print("✅ PASSED")
-                self.results['passed'].append(result)
-            else:
-                print(f"❌ FAILED ({len(result['errors'])} errors)")
-                self.results['failed'].append(result)
+        patterns = list(self.registry)
+        if self.max_workers > 1 and len(patterns) > 1:
+            chunksize = max(1, len(patterns) // (self.max_workers * 4))
+            with ProcessPoolExecutor(max_workers=self.max_workers, initializer=_init_worker) as executor:
+                # map keeps registry order, so the report reads the same as a serial run.
+                for i, (result, error_types) in enumerate(
+                        executor.map(_check_pattern_in_worker, patterns, chunksize=chunksize), 1):
+                    self.error_types.update(error_types)
+                    self._record(i, len(patterns), result)
+        else:
+            for i, pattern in enumerate(patterns, 1):
+                self._record(i, len(patterns), self.validate_pattern_rendering(pattern))
         
         return self.results
+
+    def _record(self, index: int, total: int, result: Dict):
+        """Prints one progress line and files the result."""
+        print(f"[{index}/{total}] Validating {result['pattern_id']}...", end=" ")
+        if result['status'] == 'passed':
+            print("✅ PASSED")
+            self.results['passed'].append(result)
+        else:
+            print(f"❌ FAILED ({len(result['errors'])} errors)")
+            self.results['failed'].append(result)
     
     def print_summary(self):
         """Print a summary of validation results."""
@@ -4,22 +4,56 @@ This eliminates F821 false positives for template variables.
 """
 
 import ast
+import dis
+import re
+import functools
+import hashlib
+import importlib
+import io
+import time
+import types
+import marshal
+import selectors
 import subprocess
 import tempfile
 import os
+import sys
+import signal
+import threading
+import contextlib
 import multiprocessing
+import multiprocessing.util
+from collections import OrderedDict
 from abc import ABC, abstractmethod
-from typing import List, Dict, Any
-from dataclasses import dataclass, field
+from concurrent.futures import Future, ProcessPoolExecutor, as_completed, TimeoutError as FuturesTimeoutError
+from concurrent.futures.process import BrokenProcessPool
+from typing import List, Dict, Any, Iterator, Optional, Sequence, Tuple, Union
+from dataclasses import dataclass
 from jinja2 import Environment, TemplateSyntaxError
 
+from . import linter as _linter_module
 from .linter import CustomLinter
+from .validation_cache import KnownGoodStore
 
-@dataclass
+# Slotted but not frozen: a result is built on every validation, and frozen
+# dataclasses pay for object.__setattr__ in __init__.
+@dataclass(slots=True)
 class ValidationResult:
     valid: bool
     code: str
-    errors: List[str] = field(default_factory=list)
+    # A tuple, so the common valid result shares the empty default instead
+    # of allocating a list.
+    errors: Tuple[str, ...] = ()
+    # Set by SyntaxValidator so later stages can run the code without
+    # compiling it again. Code objects do not pickle; never return one
+    # across a process boundary.
+    compiled: Optional[types.CodeType] = None
+    # Set by SyntaxValidator when asked to parse with `ast`, for the linter.
+    # Like `compiled`, never returned across a process boundary.
+    tree: Optional[ast.Module] = None
+    # Set for failures that depend on load rather than on the code, such as
+    # timeouts and crashed workers; these are never cached.
+    transient: bool = False
 
 class BaseValidator(ABC):
     @abstractmethod
@@ -27,69 +61,508 @@ class BaseValidator(ABC):
         pass
 
 class SyntaxValidator(BaseValidator):
-    def validate(self, code: str, **kwargs) -> ValidationResult:
+    """
+    Compiles the code. With a `cache_dir`, code objects are also kept on disk,
+    marshalled and keyed by the SHA-256 of the source, so code seen in an
+    earlier run is loaded instead of compiled (about 20x faster for a typical
+    candidate).
+    """
+    def __init__(self, cache_dir: Optional[str] = None):
+        # marshal's format is specific to the interpreter version.
+        self.cache_dir = os.path.join(cache_dir, sys.implementation.cache_tag) if cache_dir else None
+
+    def validate(self, code: str, parse_tree: bool = False, **kwargs) -> ValidationResult:
+        """
+        With `parse_tree`, the code is parsed with `ast` and the tree compiled,
+        and the tree is returned for the linter. Otherwise compiling the source
+        directly is cheaper than building the tree.
+        """
+        cache_path = None
+        if self.cache_dir is not None:
+            cache_path = os.path.join(self.cache_dir, hashlib.sha256(code.encode()).hexdigest())
+            compiled = self._read_cache(cache_path)
+            if compiled is not None:
+                return ValidationResult(True, code, compiled=compiled)
+        tree = None
         try:
-            ast.parse(code)
-            return ValidationResult(True, code)
+            # compile() parses exactly as ast.parse does, and the code object
+            # is handed on to the execution stage.
+            if parse_tree:
+                tree = ast.parse(code)
+                compiled = compile(tree, "<candidate>", "exec")
+            else:
+                compiled = compile(code, "<candidate>", "exec")
         except SyntaxError as e:
-            return ValidationResult(False, code, [f"Syntax error on line {e.lineno}: {e.msg}"])
+            return ValidationResult(False, code, (f"Syntax error on line {e.lineno}: {e.msg}",))
+        if cache_path is not None:
+            self._write_cache(cache_path, compiled)
+        return ValidationResult(True, code, compiled=compiled, tree=tree)
+
+    @staticmethod
+    def _read_cache(cache_path: str) -> Optional[types.CodeType]:
+        try:
+            with open(cache_path, 'rb') as f:
+                return marshal.load(f)
+        except Exception:
+            # Missing, truncated and foreign files are all just misses.
+            return None
+
+    @staticmethod
+    def _write_cache(cache_path: str, compiled: types.CodeType):
+        try:
+            os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+            # Write then rename so concurrent validators never see a partial file.
+            tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+            with open(tmp_path, 'wb') as f:
+                marshal.dump(compiled, f)
+            os.replace(tmp_path, cache_path)
+        except OSError:
+            pass
 
 class CustomLinterValidator(BaseValidator):
     def __init__(self):
         self.linter = CustomLinter()
 
-    def validate(self, code: str, **kwargs) -> ValidationResult:
-        violations = self.linter.run(code)
+    def validate(self, code: str, tree: Optional[ast.Module] = None, **kwargs) -> ValidationResult:
+        violations = self.linter.run(code, tree=tree)
         if not violations:
             return ValidationResult(True, code)
         else:
-            errors = [f"Linter ({v.code} at L{v.line}:{v.column}): {v.message}" for v in violations]
+            errors = tuple(f"Linter ({v.code} at L{v.line}:{v.column}): {v.message}" for v in violations)
             return ValidationResult(False, code, errors)
 
-def _execute_python_in_process(code: str, queue: multiprocessing.Queue):
+@functools.lru_cache(maxsize=None)
+def _flake8_checker(max_line_length: int):
+    """
+    Builds flake8's in-process machinery once per process and setting.
+    Returns (checker class, manager, formatter).
+
+    get_style_guide parses options and discovers plugins through entry
+    points, which scans installed distributions. Every Flake8Validator with
+    the same settings shares the result.
+    """
+    from flake8 import checker, processor
+    from flake8.api import legacy as flake8_api
+    from flake8.formatting.base import BaseFormatter
+
+    class _CollectingFormatter(BaseFormatter):
+        """Collects violations in memory instead of printing them."""
+        def after_init(self):
+            self.violations = []
+
+        def start(self):
+            pass
+
+        def stop(self):
+            pass
+
+        def handle(self, error):
+            self.violations.append(error)
+
+    class _SourceChecker(checker.FileChecker):
+        """A FileChecker that reads its lines from memory, not from disk."""
+        def __init__(self, lines: List[str], **kwargs):
+            self._lines = lines
+            super().__init__(**kwargs)
+
+        def _make_processor(self):
+            return processor.FileProcessor(self.filename, self.options, lines=self._lines)
+
+    style_guide = flake8_api.get_style_guide(max_line_length=max_line_length)
+    style_guide.init_report(_CollectingFormatter)
+    # The legacy API does not expose the active formatter or the checker
+    # manager on the StyleGuide.
+    application = style_guide._application
+    manager = application.file_checker_manager
+    # Check one line up front so the first real candidate doesn't pay for
+    # the plugins' lazy setup (pycodestyle's check lookups, pyflakes' tables).
+    _SourceChecker(["pass\n"], filename="<warmup>", plugins=manager.plugins,
+                   options=manager.options).run_checks()
+    return _SourceChecker, manager, application.formatter
+
+class Flake8Validator(BaseValidator):
+    """
+    Runs flake8 in-process. The StyleGuide (option parsing and plugin
+    loading, the bulk of flake8's startup cost) is built once per process
+    and shared by every validator instead of launching a flake8 subprocess.
+    Source is checked from memory: flake8's file checker is fed the lines
+    directly, so no temporary file is written and no checker Manager has to
+    resolve paths or decide whether to start a worker pool.
+    """
+    def __init__(self, max_line_length: int = 120):
+        self._source_checker, self._manager, self._formatter = _flake8_checker(max_line_length)
+
+    def validate(self, code: str, **kwargs) -> ValidationResult:
+        file_checker = self._source_checker(
+            code.splitlines(True),
+            filename="<candidate>",
+            plugins=self._manager.plugins,
+            options=self._manager.options,
+        )
+        self._formatter.violations.clear()
+        # Manager.report applies the ignore/select decisions and noqa
+        # comments and hands the survivors to the formatter.
+        self._manager.results = [file_checker.run_checks()]
+        self._manager.report()
+        violations = list(self._formatter.violations)
+        if not violations:
+            return ValidationResult(True, code)
+        errors = tuple(f"Flake8 ({v.code} at L{v.line_number}:{v.column_number}): {v.text}" for v in violations)
+        return ValidationResult(False, code, errors)
+
+# Module-level opcodes that cannot fail or have side effects: the module only
+# binds names to literals and to functions with constant defaults. Function
+# bodies are separate code objects and do not run when the module executes.
+_SIDE_EFFECT_FREE_OPCODES = frozenset(
+    dis.opmap[name] for name in (
+        "CACHE", "NOP", "RESUME", "EXTENDED_ARG", "LOAD_CONST", "STORE_NAME", "MAKE_FUNCTION",
+        "BUILD_TUPLE", "BUILD_LIST", "LIST_EXTEND", "BUILD_CONST_KEY_MAP", "POP_TOP",
+        "RETURN_VALUE", "RETURN_CONST",
+    ) if name in dis.opmap
+)
+
+def _is_side_effect_free(compiled: types.CodeType) -> bool:
+    """True if running `compiled` as a module can neither fail nor do anything observable."""
+    # Instructions are two bytes wide, opcode first.
+    return set(compiled.co_code[::2]) <= _SIDE_EFFECT_FREE_OPCODES
+
+@functools.lru_cache(maxsize=1024)
+def _compile_test(test_snippet: str) -> types.CodeType:
+    """
+    Compiles a test snippet, once per process. A pattern's rendered tests
+    repeat across most of its candidates, so a worker sees the same few
+    snippets over and over.
+    """
+    return compile(test_snippet, "<test>", "exec")
+
+def _run_candidate(program: Union[str, types.CodeType], tests: Sequence[str] = ()) -> Optional[Tuple[int, str]]:
+    """
+    Execs `program` in a fresh namespace, then each test snippet in turn in
+    that same namespace. Returns None if everything ran, otherwise the index
+    of the failing test and the formatted error (a string always pickles,
+    unlike arbitrary exceptions). A failure in the program itself is reported
+    against the first test.
+    """
+    namespace = {"__builtins__": __builtins__}
+    index = 0
+    try:
+        exec(program, namespace)
+        for index, test_snippet in enumerate(tests):
+            exec(_compile_test(test_snippet), namespace)
+    except SystemExit:
+        # An exiting script is not an error, and must not reach the pool machinery.
+        pass
+    except _ExecutionTimeout:
+        raise
+    except BaseException as e:
+        # KeyboardInterrupt, GeneratorExit and the like are the candidate's
+        # failure too, and must not escape into the worker or the caller.
+        return index, f"{type(e).__name__}: {e}"
+    return None
+
+def _execute_python_in_worker(code: Optional[str], marshalled_code: Optional[bytes] = None,
+                              tests: Sequence[str] = ()) -> Optional[Tuple[int, str]]:
+    """Runs `_run_candidate` in a pool worker, from source or a marshalled code object."""
     try:
-        exec(code, {"__builtins__": __builtins__})
-        queue.put(None)
-    except Exception as e:
-        queue.put(e)
+        return _run_candidate(marshal.loads(marshalled_code) if marshalled_code is not None else code, tests)
+    except BaseException as e:
+        # Never hand the caller an exception to re-raise through the future.
+        return 0, f"{type(e).__name__}: {e}"
+
+def _sandbox_context() -> multiprocessing.context.BaseContext:
+    """
+    The start method for sandbox workers. Where the default is fork (Linux
+    before Python 3.14), it is kept, being the cheapest. Otherwise workers
+    come from forkserver, preloaded with this module: the default elsewhere
+    is spawn, which re-imports this package in every new worker, including
+    each replacement started after a timeout, and Linux's forkserver default
+    since 3.14 would re-import it in each worker as well without the preload.
+    """
+    default = multiprocessing.get_context()
+    if default.get_start_method() == "fork" or "forkserver" not in multiprocessing.get_all_start_methods():
+        return default
+    context = multiprocessing.get_context("forkserver")
+    context.set_forkserver_preload([__name__])
+    return context
+
+_MP_CONTEXT = _sandbox_context()
+
+def _start_process_group():
+    """
+    Pool initializer: makes the worker the leader of its own process group,
+    so that `_kill_process_group` also reaches any processes candidate code
+    started. Does nothing where process groups don't exist.
+    """
+    if hasattr(os, "setpgrp"):
+        os.setpgrp()
+
+def _preload_modules(module_names: Sequence[str]):
+    """
+    Imports `module_names` ahead of the first candidate. A module that fails
+    to import is skipped; a candidate that needs it reports the failure.
+    """
+    for name in module_names:
+        try:
+            importlib.import_module(name)
+        except Exception:
+            pass
+
+def _init_sandbox_worker(preload_modules: Sequence[str] = ()):
+    """Initializer for SafeExecutionValidator's pool workers."""
+    _start_process_group()
+    _preload_modules(preload_modules)
+
+def _kill_process_group(pid: int):
+    """SIGKILLs the process group led by `pid`; on Windows, just the process."""
+    try:
+        if hasattr(os, "killpg"):
+            os.killpg(pid, signal.SIGKILL)
+        else:
+            os.kill(pid, signal.SIGTERM)
+    except ProcessLookupError:
+        pass
+
+def _shutdown_executor(executor: ProcessPoolExecutor):
+    """
+    Kills the pool's workers, along with anything they started, and shuts
+    the pool down. Workers are killed rather than joined, since a running
+    task cannot be cancelled.
+    """
+    # ProcessPoolExecutor has no public handle on its worker processes.
+    for process in list((executor._processes or {}).values()):
+        if process.pid is not None:
+            _kill_process_group(process.pid)
+    executor.shutdown(wait=True, cancel_futures=True)
+
+class _ExecutionTimeout(BaseException):
+    """Raised by the SIGALRM handler; a BaseException so candidate code cannot swallow it."""
+
+def _raise_execution_timeout(signum, frame):
+    raise _ExecutionTimeout()
+
+# Commands made only of words the shell would pass through unchanged: no
+# quoting, expansion, redirection, chaining, or leading VAR=value assignment.
+_SIMPLE_COMMAND_RE = re.compile(r"[ \t]*[\w./:,+@%-]+(?:[ \t]+[\w./:,+@%=-]+)*[ \t]*")
+
+# Bytes of each output stream of a shell command kept for its error message:
+# the end of the output, where the failure usually is. The rest is read and
+# dropped as it arrives.
+SHELL_OUTPUT_LIMIT = 64 * 1024
+
+def _drain_output(process: subprocess.Popen, timeout: float,
+                  limit: int = SHELL_OUTPUT_LIMIT) -> Tuple[bytes, bytes]:
+    """
+    Reads the process's stdout and stderr until both close and waits for it
+    to exit, like `communicate`, but keeps only the last `limit` bytes of
+    each. Raises subprocess.TimeoutExpired after `timeout` seconds.
+    """
+    if sys.platform == "win32":
+        # Pipes cannot be selected on Windows.
+        stdout, stderr = process.communicate(timeout=timeout)
+        return stdout[-limit:], stderr[-limit:]
+    deadline = time.monotonic() + timeout
+    tails = {process.stdout: bytearray(), process.stderr: bytearray()}
+    with selectors.DefaultSelector() as selector:
+        for pipe in tails:
+            selector.register(pipe, selectors.EVENT_READ)
+        while selector.get_map():
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise subprocess.TimeoutExpired(process.args, timeout)
+            for key, _ in selector.select(remaining):
+                chunk = os.read(key.fd, 65536)
+                if not chunk:
+                    selector.unregister(key.fileobj)
+                    key.fileobj.close()
+                    continue
+                tail = tails[key.fileobj]
+                tail += chunk
+                if len(tail) > limit:
+                    del tail[:-limit]
+    process.wait(timeout=max(deadline - time.monotonic(), 0))
+    return bytes(tails[process.stdout]), bytes(tails[process.stderr])
 
 class SafeExecutionValidator(BaseValidator):
-    def __init__(self, timeout: int = 5):
+    """
+    Executes candidate code and its unit-test snippets.
+
+    By default each Python run happens in a worker process from a pool that
+    is kept for the validator's lifetime, so process startup (and any heavy
+    imports the candidates share) is paid once rather than per run. Every run
+    gets a fresh globals namespace, but process-wide side effects of earlier
+    candidates persist in the worker. A run that times out or kills its worker
+    tears the pool down; the next run starts a new one.
+
+    With `in_process=True` the code is exec'd in a fresh namespace inside the
+    current process, which avoids process startup entirely; only use this for
+    trusted patterns, since the code shares the validator's interpreter.
+
+    `preload_modules` are imported by each worker as it starts, so heavy
+    imports the candidates share (torch, sklearn, ...) are paid once per pool
+    rather than by candidates. A new pool is waited for, with no time limit,
+    before a candidate's clock starts, so however long the imports take they
+    never count against the first candidate, nor the first one after every
+    timeout.
+    """
+    def __init__(self, timeout: int = 5, in_process: bool = False, max_workers: int = 1,
+                 preload_modules: Sequence[str] = ()):
         self.timeout = timeout
+        self.in_process = in_process
+        self.max_workers = max_workers
+        self.preload_modules = tuple(preload_modules)
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._executor_finalizer: Optional[multiprocessing.util.Finalize] = None
+        # A no-op job sent to each new pool; done once a worker has started.
+        self._executor_ready: Optional[Future] = None
 
-    def validate(self, code: str, tests: List[str] = [], **kwargs) -> ValidationResult:
+    def validate(self, code: str, tests: Sequence[str] = (), compiled: Optional[types.CodeType] = None,
+                 **kwargs) -> ValidationResult:
         if not tests:
-            return self._run_python_code(code)
+            if compiled is not None and _is_side_effect_free(compiled):
+                # Only definitions and literals: running it cannot fail, so skip the sandbox.
+                return ValidationResult(True, code)
+            return self._run_python_code(code, compiled)
         
+        # Consecutive Python tests share one run: the code executes once and
+        # the tests follow in its namespace, instead of re-running the code
+        # from scratch for every test. Shell tests keep their place in order.
+        python_tests: List[str] = []
         for test_snippet in tests:
             if test_snippet.startswith("shell_exec:"):
+                if python_tests:
+                    result = self._run_python_code(code, compiled, python_tests)
+                    python_tests = []
+                    if not result.valid:
+                        return result
                 command = test_snippet.replace("shell_exec:", "").strip()
                 result = self._run_shell_command(code, command)
+                if not result.valid:
+                    return result
             else:
-                full_script = f"{code}\n\n# --- Running validation test ---\n{test_snippet}"
-                result = self._run_python_code(full_script)
-            
+                python_tests.append(test_snippet)
+        if python_tests:
+            result = self._run_python_code(code, compiled, python_tests)
             if not result.valid:
                 return result
         
         return ValidationResult(True, code)
 
-    def _run_python_code(self, code_to_run: str) -> ValidationResult:
-        queue = multiprocessing.Queue()
-        process = multiprocessing.Process(target=_execute_python_in_process, args=(code_to_run, queue))
-        process.start()
-        process.join(timeout=self.timeout)
-        if process.is_alive():
-            process.terminate()
-            process.join()
-            return ValidationResult(False, code_to_run, [f"Python execution timed out after {self.timeout}s."])
+    def _run_python_code(self, code_to_run: str, compiled: Optional[types.CodeType] = None,
+                         tests: Sequence[str] = ()) -> ValidationResult:
+        """
+        Runs `code_to_run` followed by `tests`, using `compiled` instead of
+        recompiling the code when given. The time limit scales with the
+        number of tests, as each used to get a full run of its own.
+        """
+        timeout = self.timeout * max(1, len(tests))
+        if self.in_process:
+            return self._run_python_code_in_process(code_to_run, compiled, tests, timeout)
+        executor = self._get_executor()
         try:
-            result = queue.get_nowait()
-            if isinstance(result, Exception):
-                return ValidationResult(False, code_to_run, [f"Python execution error: {type(result).__name__}: {result}"])
-            return ValidationResult(True, code_to_run)
-        except:
-            return ValidationResult(True, code_to_run)
+            if self._executor_ready is not None:
+                # Worker start-up, preload imports included, is not the candidate's time.
+                self._executor_ready.result()
+                self._executor_ready = None
+            if compiled is not None:
+                # Code objects do not pickle, but marshal round-trips them far
+                # faster than the worker could recompile the source.
+                future = executor.submit(_execute_python_in_worker, None, marshal.dumps(compiled), tests)
+            else:
+                future = executor.submit(_execute_python_in_worker, code_to_run, None, tests)
+            outcome = future.result(timeout=timeout)
+        except FuturesTimeoutError:
+            self.close()
+            return ValidationResult(False, code_to_run, (f"Python execution timed out after {timeout}s.",),
+                                    transient=True)
+        except BrokenProcessPool:
+            self.close()
+            return ValidationResult(False, code_to_run,
+                                    ("Python execution error: worker process exited unexpectedly.",),
+                                    transient=True)
+        except Exception as e:
+            # The worker returns failures rather than raising them, so this is
+            # the pool machinery (a result that failed to pickle, say).
+            self.close()
+            return ValidationResult(False, code_to_run, (f"Python execution error: {type(e).__name__}: {e}",),
+                                    transient=True)
+        return self._execution_result(code_to_run, tests, outcome)
+
+    @staticmethod
+    def _execution_result(code: str, tests: Sequence[str], outcome: Optional[Tuple[int, str]]) -> ValidationResult:
+        if outcome is None:
+            return ValidationResult(True, code)
+        index, error = outcome
+        if tests:
+            # Report the failing test as the script it used to run as on its own.
+            code = f"{code}\n\n# --- Running validation test ---\n{tests[index]}"
+        return ValidationResult(False, code, (f"Python execution error: {error}",))
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.max_workers, mp_context=_MP_CONTEXT,
+                                                 initializer=_init_sandbox_worker,
+                                                 initargs=(self.preload_modules,))
+            # Also runs if the validator is garbage collected, and at exit before
+            # multiprocessing joins child processes: pool workers are not daemonic,
+            # so a pool left open would keep a process that owns one (such as
+            # a dataset worker) from ever exiting.
+            self._executor_finalizer = multiprocessing.util.Finalize(
+                self, _shutdown_executor, args=(self._executor,), exitpriority=10
+            )
+            # Any job makes the pool start a worker.
+            self._executor_ready = self._executor.submit(os.getpid)
+        return self._executor
+
+    def warm_up(self):
+        """
+        Starts the worker pool in the background, so that the first validation
+        does not wait for a worker to start and import `preload_modules`.
+        Does nothing when running in-process.
+        """
+        if not self.in_process:
+            self._get_executor()
+
+    def close(self):
+        """Shuts down the worker pool, if one is running."""
+        finalizer, self._executor_finalizer = self._executor_finalizer, None
+        self._executor = None
+        self._executor_ready = None
+        if finalizer is not None:
+            finalizer()
+
+    def _run_python_code_in_process(self, code_to_run: str, compiled: Optional[types.CodeType] = None,
+                                    tests: Sequence[str] = (), timeout: Optional[int] = None) -> ValidationResult:
+        timeout = timeout or self.timeout
+        # SIGALRM only works on POSIX and in the main thread; elsewhere the run
+        # has no wall-clock limit.
+        use_alarm = hasattr(signal, "SIGALRM") and threading.current_thread() is threading.main_thread()
+        if use_alarm:
+            previous_handler = signal.signal(signal.SIGALRM, _raise_execution_timeout)
+            signal.alarm(timeout)
+        try:
+            with contextlib.redirect_stdout(io.StringIO()):
+                if compiled is None:
+                    compiled = compile(code_to_run, "<candidate>", "exec")
+                outcome = _run_candidate(compiled, tests)
+        except _ExecutionTimeout:
+            return ValidationResult(False, code_to_run, (f"Python execution timed out after {timeout}s.",),
+                                    transient=True)
+        except (SyntaxError, ValueError) as e:
+            # Only reachable from compiling source that skipped SyntaxValidator.
+            return ValidationResult(False, code_to_run, (f"Python execution error: {type(e).__name__}: {e}",))
+        finally:
+            if use_alarm:
+                signal.alarm(0)
+                signal.signal(signal.SIGALRM, previous_handler)
+        return self._execution_result(code_to_run, tests, outcome)
+
+    @staticmethod
+    def _start_command(args: Union[str, List[str]], shell: bool) -> subprocess.Popen:
+        # A session of its own, so a timeout kills everything the command
+        # started; killing only the shell would leave its children running,
+        # holding the output pipes open.
+        return subprocess.Popen(args, shell=shell, stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+                                start_new_session=True)
 
     def _run_shell_command(self, code_content: str, command: str) -> ValidationResult:
         with tempfile.NamedTemporaryFile(mode='w', delete=False, suffix=".py", dir=".") as f:
@@ -97,47 +570,140 @@ class SafeExecutionValidator(BaseValidator):
             script_path = f.name
         try:
             final_command = command.replace("{{ SCRIPT_PATH }}", script_path)
-            result = subprocess.run(final_command, shell=True, capture_output=True, text=True, timeout=self.timeout + 5)
-            if result.returncode != 0:
-                error_msg = f"Shell command failed with exit code {result.returncode}.\nSTDOUT:\n{result.stdout}\nSTDERR:\n{result.stderr}"
-                return ValidationResult(False, code_content, [error_msg])
+            # A plain "program arg ..." line needs no shell, so run it directly
+            # and save starting /bin/sh; anything else goes through the shell.
+            # A missing program is left to the shell, which reports it the
+            # usual way (exit status 127).
+            process = None
+            if _SIMPLE_COMMAND_RE.fullmatch(final_command):
+                try:
+                    process = self._start_command(final_command.split(), shell=False)
+                except OSError:
+                    pass
+            if process is None:
+                process = self._start_command(final_command, shell=True)
+            try:
+                stdout, stderr = _drain_output(process, timeout=self.timeout + 5)
+            except subprocess.TimeoutExpired:
+                _kill_process_group(process.pid)
+                process.communicate()
+                return ValidationResult(False, code_content,
+                                        (f"Shell command timed out after {self.timeout + 5}s.",), transient=True)
+            if process.returncode != 0:
+                # Output is only decoded for the error message.
+                stdout = stdout.decode(errors="replace")
+                stderr = stderr.decode(errors="replace")
+                error_msg = f"Shell command failed with exit code {process.returncode}.\nSTDOUT:\n{stdout}\nSTDERR:\n{stderr}"
+                return ValidationResult(False, code_content, (error_msg,))
             return ValidationResult(True, code_content)
-        except subprocess.TimeoutExpired:
-            return ValidationResult(False, code_content, [f"Shell command timed out after {self.timeout + 5}s."])
         finally:
-            if os.path.exists(script_path):
+            try:
                 os.remove(script_path)
+            except FileNotFoundError:
+                pass
+
+_WORKER_STATE: Dict[str, Any] = {}
+
+# Results of this many distinct (code, tests) pairs are remembered by each
+# ValidationPipeline, least recently used first out.
+RESULT_CACHE_SIZE = 4096
+
+ResultKey = Tuple[bytes, Tuple[bytes, ...]]
+CachedResult = Tuple[bool, str, Tuple[str, ...]]
+
+def _validator_version() -> str:
+    """Identifies the validator code, so passes recorded by another version are not reused."""
+    stats = (os.stat(path) for path in (__file__, _linter_module.__file__))
+    return "\0".join(f"{st.st_mtime_ns}:{st.st_size}" for st in stats)
+
+def _result_key(code: str, tests: Sequence[str]) -> ResultKey:
+    """SHA-256 digests of the code and of each test; collisions are not a practical concern."""
+    return (
+        hashlib.sha256(code.encode()).digest(),
+        tuple(hashlib.sha256(test.encode()).digest() for test in tests),
+    )
+
+def _init_pipeline_worker(timeout: int, code_cache_dir: Optional[str] = None,
+                          preload_modules: Sequence[str] = ()):
+    # Each worker validates exactly as `validate` does, running candidates in
+    # a sandbox pool of its own; the worker itself never runs candidate code,
+    # so it cannot be hung or killed by it. Results are cached by the parent.
+    pipeline = ValidationPipeline(code_cache_dir=code_cache_dir, preload_modules=preload_modules,
+                                  result_cache_size=0)
+    pipeline.execution_validator.timeout = timeout
+    pipeline.warm_up()
+    _WORKER_STATE['pipeline'] = pipeline
+
+def _validate_in_worker(job: Tuple[int, str, List[str]]) -> Tuple[int, ValidationResult]:
+    index, code, tests = job
+    return index, _WORKER_STATE['pipeline'].validate(code=code, tests=tests)
+
+def _shutdown_pipeline_pool(executor: ProcessPoolExecutor):
+    """Shuts the `validate_many` pool down; each worker closes its own sandbox on the way out."""
+    executor.shutdown(wait=True, cancel_futures=True)
 
 class ValidationPipeline:
-    def __init__(self, use_pylint: bool = False):
+    def __init__(self, use_pylint: bool = False, in_process_execution: bool = False,
+                 max_workers: Optional[int] = None, result_cache_size: int = RESULT_CACHE_SIZE,
+                 code_cache_dir: Optional[str] = None, known_good_path: Optional[str] = None,
+                 preload_modules: Sequence[str] = ()):
+        # If set, compiled candidates are kept in this directory across runs
+        # (see SyntaxValidator); e.g. os.path.join(registry.CACHE_DIR, "code").
+        self.code_cache_dir = code_cache_dir
+        self.linter_validator = CustomLinterValidator()
         self.static_validators: List[BaseValidator] = [
-            SyntaxValidator(),
-            CustomLinterValidator()
+            SyntaxValidator(cache_dir=code_cache_dir),
+            self.linter_validator
         ]
-        self.execution_validator = SafeExecutionValidator()
+        # Imported up front by every process that runs candidates.
+        self.preload_modules = tuple(preload_modules)
+        self.execution_validator = SafeExecutionValidator(in_process=in_process_execution,
+                                                          preload_modules=self.preload_modules)
         # NEW: Jinja2 environment for template rendering
         self.jinja_env = Environment(trim_blocks=True, lstrip_blocks=True)
+        # Environment.from_string lexes, parses and compiles on every call;
+        # the same pattern's code and tests come back with each parameter set.
+        self._compile_template = functools.lru_cache(maxsize=512)(self.jinja_env.from_string)
+        # Size of the pool behind `validate_many`; defaults to the CPU count.
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._pool_finalizer: Optional[multiprocessing.util.Finalize] = None
+        # Duplicate candidates (common when sampling many variants of one
+        # pattern) get the stored result instead of another sandbox run.
+        # Entries keep only plain values; results are rebuilt on every hit so
+        # callers can't alter the cached copy.
+        self.result_cache_size = result_cache_size
+        self._results: "OrderedDict[ResultKey, CachedResult]" = OrderedDict()
+        # If set, an SQLite file recording every pass, consulted after the
+        # in-memory cache and kept across runs; e.g.
+        # os.path.join(registry.CACHE_DIR, "known_good.sqlite").
+        self._known_good = KnownGoodStore(known_good_path, _validator_version()) if known_good_path else None
 
-    def _render_template_with_defaults(self, template_str: str, parameters: Dict[str, Any]) -> str:
+    def _render_template_with_defaults(self, template_str: str, context: Dict[str, Any]) -> str:
         """
         Renders Jinja2 template variables with their default parameter values.
         This ensures linting sees valid Python code, not template syntax.
         
         Args:
             template_str: Code string potentially containing {{ var }} expressions
-            parameters: Dict mapping parameter names to Parameter objects
+            context: Jinja globals plus the parameters' default values, built
+                     once by `_render_with_defaults` for the code and all its tests
         
         Returns:
             Rendered code string with all template variables substituted
         """
-        # Build context from parameter defaults
-        context = {}
-        for name, param in parameters.items():
-            context[name] = param.default
-        
+        if "{{" not in template_str and "{%" not in template_str and "{#" not in template_str:
+            # Nothing for Jinja to substitute. Apply the only changes it would
+            # make to plain text: normalised newlines, one trailing newline dropped.
+            text = template_str.replace("\r\n", "\n").replace("\r", "\n")
+            return text[:-1] if text.endswith("\n") else text
+
         try:
-            template = self.jinja_env.from_string(template_str)
-            return template.render(context)
+            template = self._compile_template(template_str)
+            # render() would merge the context with the globals into a fresh
+            # dict on every call; this one already holds them and is only read.
+            jinja_context = template.new_context(context, shared=True)
+            return self.jinja_env.concat(template.root_render_func(jinja_context))
         except TemplateSyntaxError as e:
             # If template has syntax errors, return original and let validation catch it
             return template_str
@@ -145,7 +711,8 @@ class ValidationPipeline:
             # Any other rendering errors, return original
             return template_str
 
-    def validate(self, code: str, tests: List[str] = [], parameters: Dict[str, Any] = None) -> ValidationResult:
+    def validate(self, code: str, tests: Sequence[str] = (),
+                 parameters: Optional[Dict[str, Any]] = None) -> ValidationResult:
         """
         Standard validation pipeline. Now with optional template rendering.
         
@@ -156,18 +723,164 @@ class ValidationPipeline:
         """
         # NEW: Pre-render templates if parameters are provided
         if parameters:
-            code = self._render_template_with_defaults(code, parameters)
-            # Also render test snippets
-            rendered_tests = []
-            for test in tests:
-                rendered_tests.append(self._render_template_with_defaults(test, parameters))
-            tests = rendered_tests
+            code, tests = self._render_with_defaults(code, tests, parameters)
         
-        # Run static validators
+        key = _result_key(code, tests)
+        result = self._cached_result(key, code)
+        if result is None:
+            result = self._validate_uncached(code, tests)
+            self._store_result(key, result)
+        return result
+
+    def _render_with_defaults(self, code: str, tests: Sequence[str],
+                              parameters: Dict[str, Any]) -> Tuple[str, List[str]]:
+        """Renders the code and its tests with the parameters' defaults."""
+        # Build context from parameter defaults
+        context = dict(self.jinja_env.globals)
+        context.update((name, param.default) for name, param in parameters.items())
+        code = self._render_template_with_defaults(code, context)
+        # Also render test snippets
+        tests = [self._render_template_with_defaults(test, context) for test in tests]
+        return code, tests
+
+    def _validate_uncached(self, code: str, tests: Sequence[str]) -> ValidationResult:
+        # Run static validators. When the linter will walk an `ast` tree,
+        # the syntax stage builds it and compiles from it, so the code is
+        # parsed once for both.
+        parse_tree = self.linter_validator.linter.needs_ast(code)
+        compiled = tree = None
         for validator in self.static_validators:
-            result = validator.validate(code=code)
+            result = validator.validate(code=code, parse_tree=parse_tree, tree=tree)
             if not result.valid:
                 return result
+            if result.compiled is not None:
+                compiled = result.compiled
+            if result.tree is not None:
+                tree = result.tree
         
         # Run execution validator
-        return self.execution_validator.validate(code=code, tests=tests)
\ No newline at end of file
+        return self.execution_validator.validate(code=code, tests=tests, compiled=compiled)
+
+    def clear_cache(self):
+        """Forgets the validation results remembered in memory."""
+        self._results.clear()
+
+    def _cached_result(self, key: ResultKey, code: str) -> Optional[ValidationResult]:
+        entry = self._results.get(key)
+        if entry is None:
+            if self._known_good is not None and self._known_good.key(*key) in self._known_good:
+                return ValidationResult(True, code)
+            return None
+        self._results.move_to_end(key)
+        valid, code, errors = entry
+        return ValidationResult(valid, code, errors)
+
+    def _store_result(self, key: ResultKey, result: ValidationResult):
+        if self._known_good is not None and result.valid:
+            self._known_good.add(self._known_good.key(*key))
+        # A timeout or crash may not happen again; only outcomes decided by
+        # the code itself are remembered.
+        if self.result_cache_size <= 0 or result.transient:
+            return
+        self._results[key] = (result.valid, result.code, result.errors)
+        if len(self._results) > self.result_cache_size:
+            self._results.popitem(last=False)
+
+    def validate_many(self, items: Sequence[Union[Tuple[str, List[str]],
+                                                  Tuple[str, List[str], Optional[Dict[str, Any]]]]]
+                      ) -> List[ValidationResult]:
+        """
+        Validates many (code, tests) pairs at once on a pool of worker
+        processes that is kept across calls. Each worker runs the full
+        pipeline as `validate` does, with a sandbox pool of its own, so the
+        results are the same.
+
+        An item may carry a third element, the parameters to render its
+        templates with, as for `validate`. Rendering is done here, before
+        the cache lookup.
+
+        Returns one result per item, in input order. Items already in the
+        result cache, and repeats within `items`, are not sent to the pool.
+        """
+        results: List[Optional[ValidationResult]] = [None] * len(items)
+        # Indices of the items waiting on each job, the job's own index first.
+        waiting: Dict[ResultKey, List[int]] = {}
+        keys: Dict[int, ResultKey] = {}
+        jobs = []
+        for index, (code, tests, *rest) in enumerate(items):
+            if rest and rest[0]:
+                code, tests = self._render_with_defaults(code, tests, rest[0])
+            key = _result_key(code, tests)
+            if key in waiting:
+                waiting[key].append(index)
+                continue
+            results[index] = self._cached_result(key, code)
+            if results[index] is None:
+                waiting[key] = [index]
+                keys[index] = key
+                jobs.append((index, code, list(tests)))
+        if not jobs:
+            return results
+
+        # Longest candidates first, so no worker is left with a long job at the
+        # end.
+        jobs.sort(key=lambda job: len(job[1]), reverse=True)
+        for index, result in self._run_jobs(jobs):
+            key = keys[index]
+            self._store_result(key, result)
+            results[index] = result
+            for repeat in waiting[key][1:]:
+                results[repeat] = ValidationResult(result.valid, result.code, result.errors,
+                                                   transient=result.transient)
+        return results
+
+    def _run_jobs(self, jobs: List[Tuple[int, str, List[str]]]) -> Iterator[Tuple[int, ValidationResult]]:
+        """Runs `jobs` on the pool and yields (index, result) as each finishes."""
+        executor = self._get_pool()
+        futures = {executor.submit(_validate_in_worker, job): job for job in jobs}
+        broken = False
+        for future in as_completed(futures):
+            index, code, _ = futures[future]
+            try:
+                yield future.result()
+            except Exception as e:
+                # Only the pool machinery fails here; candidates' own failures
+                # come back as results.
+                broken = broken or isinstance(e, BrokenProcessPool)
+                error = f"Validation error: {type(e).__name__}: {e}"
+                yield index, ValidationResult(False, code, (error,), transient=True)
+        if broken:
+            self._close_pool()
+
+    def warm_up(self):
+        """Starts the execution validator's workers in the background; see `SafeExecutionValidator.warm_up`."""
+        self.execution_validator.warm_up()
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        if self._pool is None:
+            # Not a multiprocessing.Pool: its workers are daemonic, and could
+            # not start the sandbox, nor candidates their own processes.
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=_MP_CONTEXT,
+                initializer=_init_pipeline_worker,
+                initargs=(self.execution_validator.timeout, self.code_cache_dir, self.preload_modules),
+            )
+            # As for the sandbox pool: also runs on garbage collection and at exit.
+            self._pool_finalizer = multiprocessing.util.Finalize(
+                self, _shutdown_pipeline_pool, args=(self._pool,), exitpriority=10
+            )
+        return self._pool
+
+    def _close_pool(self):
+        finalizer, self._pool_finalizer = self._pool_finalizer, None
+        self._pool = None
+        if finalizer is not None:
+            finalizer()
+
+    def close(self):
+        """Stops the `validate_many` pool and the execution validator's workers."""
+        self._close_pool()
+        self.execution_validator.close()
+        if self._known_good is not None:
+            self._known_good.close()
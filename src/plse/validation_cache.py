@@ -0,0 +1,64 @@
+"""
+A persistent record of candidates that passed validation, so that later
+runs can accept them again without re-running any stage.
+"""
+
+import os
+import sys
+import sqlite3
+import hashlib
+from typing import Sequence
+
+class KnownGoodStore:
+    """
+    An SQLite table of keys for (code, tests) pairs that validated. Only
+    passes are kept: failures include timeouts and other load-dependent
+    outcomes that deserve another try.
+
+    Keys are salted with the interpreter version and a caller-supplied
+    validator version, so a different Python or a changed validator starts
+    from an empty record. The connection is opened on first use, in the
+    process that uses it; a process forked after that opens its own.
+    """
+    def __init__(self, path: str, version: str = ""):
+        self.path = path
+        self._salt = f"{sys.version}\0{version}\0".encode()
+        self._connection = None
+        self._pid = None
+        # A connection inherited across a fork, kept referenced so that it is
+        # never closed (or checkpointed) by the child.
+        self._inherited = None
+
+    def key(self, code_digest: bytes, test_digests: Sequence[bytes]) -> bytes:
+        digest = hashlib.blake2b(self._salt, digest_size=32)
+        digest.update(code_digest)
+        for test_digest in test_digests:
+            digest.update(test_digest)
+        return digest.digest()
+
+    def __contains__(self, key: bytes) -> bool:
+        row = self._connect().execute("SELECT 1 FROM known_good WHERE key = ?", (key,)).fetchone()
+        return row is not None
+
+    def add(self, key: bytes):
+        self._connect().execute("INSERT OR IGNORE INTO known_good (key) VALUES (?)", (key,))
+
+    def close(self):
+        if self._connection is not None and self._pid == os.getpid():
+            self._connection.close()
+        self._connection = None
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._connection is not None and self._pid != os.getpid():
+            # SQLite connections must not be used across a fork.
+            self._inherited, self._connection = self._connection, None
+        if self._connection is None:
+            # Autocommit, without waiting for each insert to reach the disk:
+            # losing the last few entries in a crash only costs re-validation.
+            connection = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=OFF")
+            connection.execute("CREATE TABLE IF NOT EXISTS known_good (key BLOB PRIMARY KEY) WITHOUT ROWID")
+            self._connection = connection
+            self._pid = os.getpid()
+        return self._connection